@@ -10,8 +10,12 @@ cd "$(dirname "$0")"
 
 # Ejecutar build.py (descarga feeds automáticamente y genera el sitio)
 python3 build.py
+status=$?
 
-if [ $? -eq 0 ]; then
+if [ $status -eq 3 ]; then
+    echo ""
+    echo "✅ El sitio ya estaba actualizado, no hubo cambios en los feeds"
+elif [ $status -eq 0 ]; then
     echo ""
     echo "✅ Sitio actualizado exitosamente!"
     echo "📍 Ubicación: $(pwd)/docs/index.html"
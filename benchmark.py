@@ -0,0 +1,440 @@
+#!/usr/bin/env python3
+"""
+Benchmarks de build.py
+Todo se ejecuta sin conexión, con feeds y datos sintéticos
+
+Uso:
+    python3 benchmark.py suite --channels 100 --output resultados.json
+    python3 benchmark.py compare antes.json despues.json
+    python3 benchmark.py render --sizes 100 1000 10000
+    python3 benchmark.py keywords --titles 100000
+    python3 benchmark.py minify --pages 200
+"""
+import argparse
+import contextlib
+import html
+import json
+import platform
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import build
+
+# Palabras para armar títulos y cuerpos sintéticos
+WORDS = (
+    'Instituto', 'La Gloria', 'Alta Córdoba', 'gol', 'partido', 'resumen', 'Talleres',
+    'Belgrano', 'conferencia', 'análisis', 'fecha', 'apertura', 'copa', 'hinchas',
+    'entrenamiento', 'refuerzo', 'victoria', 'derrota', 'empate', 'estadio'
+)
+
+
+def synthetic_text(rng, words):
+    """Texto aleatorio de `words` palabras"""
+    return ' '.join(rng.choice(WORDS) for _ in range(words))
+
+def generate_wordpress_feed(path, items, body_size, seed=0):
+    """Escribe un feed RSS de WordPress sintético
+
+    Args:
+        path: Archivo de salida
+        items: Cantidad de <item>
+        body_size: Tamaño aproximado (bytes) de cada content:encoded
+    """
+    rng = random.Random(seed)
+    base_date = datetime(2026, 2, 9, 21, 0, 0)
+    parts = ["""<?xml version="1.0" encoding="UTF-8"?>
+<rss version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/">
+<channel>
+    <title>Instituto ACC</title>
+    <link>https://institutoacc.com.ar</link>
+"""]
+    for i in range(items):
+        pub_date = (base_date - timedelta(hours=i)).strftime('%a, %d %b %Y %H:%M:%S +0000')
+        paragraph = f'<p>{synthetic_text(rng, 12)}</p>'
+        body = f'<img src="https://institutoacc.com.ar/wp-content/uploads/2026/02/foto-{i}.jpg" />'
+        body += paragraph * max(1, body_size // len(paragraph))
+        parts.append(f"""    <item>
+        <title>{html.escape(synthetic_text(rng, 8))}</title>
+        <link>https://institutoacc.com.ar/index.php/{i}/</link>
+        <guid isPermaLink="false">https://institutoacc.com.ar/?p={i}</guid>
+        <pubDate>{pub_date}</pubDate>
+        <description><![CDATA[{synthetic_text(rng, 40)}]]></description>
+        <content:encoded><![CDATA[{body}]]></content:encoded>
+    </item>
+""")
+    parts.append('</channel>\n</rss>\n')
+    Path(path).write_text(''.join(parts), encoding='utf-8')
+
+def generate_youtube_feed(path, entries, channel_index, seed=0):
+    """Escribe un feed Atom de YouTube sintético (videos del más nuevo al más viejo)"""
+    rng = random.Random(seed * 1000 + channel_index)
+    base_date = datetime(2026, 2, 9, 21, 0, 0) - timedelta(minutes=channel_index)
+    parts = [f"""<?xml version="1.0" encoding="UTF-8"?>
+<feed xmlns:yt="http://www.youtube.com/xml/schemas/2015" xmlns:media="http://search.yahoo.com/mrss/" xmlns="http://www.w3.org/2005/Atom">
+    <title>Canal {channel_index}</title>
+"""]
+    for i in range(entries):
+        video_id = f'c{channel_index:04d}v{i:05d}'
+        published = (base_date - timedelta(hours=i * 7)).strftime('%Y-%m-%dT%H:%M:%S+00:00')
+        title = html.escape(synthetic_text(rng, 9))
+        parts.append(f"""    <entry>
+        <id>yt:video:{video_id}</id>
+        <yt:videoId>{video_id}</yt:videoId>
+        <title>{title}</title>
+        <link rel="alternate" href="https://www.youtube.com/watch?v={video_id}"/>
+        <author><name>Canal {channel_index}</name></author>
+        <published>{published}</published>
+        <media:group>
+            <media:title>{title}</media:title>
+            <media:thumbnail url="https://i1.ytimg.com/vi/{video_id}/hqdefault.jpg" width="480" height="360"/>
+            <media:description>{html.escape(synthetic_text(rng, 60))}</media:description>
+        </media:group>
+    </entry>
+""")
+    parts.append('</feed>\n')
+    Path(path).write_text(''.join(parts), encoding='utf-8')
+
+class PhaseTimer:
+    """Acumula tiempos por fase"""
+
+    def __init__(self):
+        self.phases = {}
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.phases[name] = self.phases.get(name, 0.0) + elapsed
+            print(f"   {name:<28} {elapsed * 1000:>10.2f} ms")
+
+
+def synthetic_videos(count):
+    """Genera `count` videos con el formato de parse_youtube_feed()"""
+    return [
+        {
+            'title': f'Instituto vs Rival {i} - Resumen del partido',
+            'link': f'https://www.youtube.com/watch?v=video{i:07d}',
+            'description': 'Resumen y goles del partido de La Gloria. ' * 4,
+            'pub_date': '09/02/2026',
+            'pub_date_raw': f'2026-02-09T21:{i // 60 % 60:02d}:{i % 60:02d}+00:00',
+            'image': f'https://i.ytimg.com/vi/video{i:07d}/hqdefault.jpg',
+            'author': f'Canal {i % 13}',
+            'video_id': f'video{i:07d}'
+        }
+        for i in range(count)
+    ]
+
+def bench_render(sizes, repeat=3):
+    """Mide generate_html() con distintas cantidades de tarjetas
+
+    Si el render es lineal, el tiempo por tarjeta se mantiene constante
+    a medida que crece la cantidad de tarjetas.
+    """
+    print(f"⏱️  Render de index.html (mejor de {repeat} corridas)")
+    print(f"   {'tarjetas':>9}  {'total (ms)':>11}  {'por tarjeta (µs)':>17}")
+
+    stylesheet_href = build.stylesheet_url()
+    results = []
+    for size in sizes:
+        videos = synthetic_videos(size)
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            build.generate_html(videos, videos, videos, videos, stylesheet_href)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+
+        cards = size * 4
+        results.append({'cards': cards, 'seconds': best})
+        print(f"   {cards:>9}  {best * 1000:>11.2f}  {best / cards * 1e6:>17.2f}")
+
+    return results
+
+def synthetic_titles(count, seed=0):
+    """Títulos sintéticos con variantes de mayúsculas y acentos"""
+    rng = random.Random(seed)
+    variants = (str, str.upper, str.lower, lambda title: title.replace('o', 'ó'))
+    return [rng.choice(variants)(synthetic_text(rng, 10)) for _ in range(count)]
+
+def bench_keywords(count, keywords=None, repeat=3, seed=0):
+    """Compara el filtro de títulos compilado con la búsqueda ingenua
+
+    La versión ingenua pasa cada título a minúsculas y lo recorre una vez
+    por palabra clave (como hacía parse_youtube_feed() antes).
+    """
+    keywords = keywords or build.VIDEO_FILTER_KEYWORDS
+    titles = synthetic_titles(count, seed)
+    print(f"⏱️  Filtro de {count} títulos con {len(keywords)} palabras clave (mejor de {repeat} corridas)")
+
+    def naive(title):
+        title_lower = title.lower()
+        return any(keyword.lower() in title_lower for keyword in keywords)
+
+    start = time.perf_counter()
+    matcher = build.KeywordMatcher(keywords)
+    compile_seconds = time.perf_counter() - start
+
+    results = {'titles': count, 'keywords': len(keywords), 'compile_seconds': compile_seconds}
+    for name, matches in (('ingenuo', naive), ('compilado', matcher.matches)):
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            found = sum(1 for title in titles if matches(title))
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        results[name] = {'seconds': best, 'matches': found}
+        print(f"   {name:<12} {best * 1000:>10.2f} ms  {best / count * 1e6:>6.2f} µs/título  {found:>7} coincidencias")
+
+    print(f"   (compilación: {compile_seconds * 1e6:.0f} µs)")
+    return results
+
+def bench_minify(pages, files=()):
+    """Minifica páginas generadas y verifica que el DOM no cambie
+
+    Usa un index.html y páginas de video sintéticos (con descripciones de
+    varias líneas, que se muestran con white-space: pre-wrap) más los
+    archivos indicados. Además comprueba que la verificación detecte un
+    cambio en una descripción.
+
+    Returns:
+        Dict con los bytes antes y después, o None si algún DOM cambió
+    """
+    stylesheet_href = build.stylesheet_url()
+    videos = synthetic_videos(pages)
+    for i, video in enumerate(videos):
+        video['description'] = f"Resumen del partido {i}\n\n   Goles:  Instituto 2 &amp; Rival 1\n\t#instituto  #lagloria"
+
+    documents = [('index.html', build.generate_html(videos[:50], videos[:10], videos[:6], videos[:15], stylesheet_href))]
+    documents += [(f"videos/{video['video_id']}", build.generate_video_page(video, video['video_id'], stylesheet_href))
+                  for video in videos]
+    # Un & suelto (HTML válido) no tiene que convertirse en una entidad
+    documents.append(('ampersand.html', '<p class="card-text">Q&A con Diego  &  el plantel</p>\n'))
+    documents += [(str(path), Path(path).read_text(encoding='utf-8')) for path in files]
+
+    print(f"✂️  Minificación de {len(documents)} páginas")
+    original = minified = 0
+    failed = []
+    start = time.perf_counter()
+    for name, content in documents:
+        result = build.minify_html(content)
+        if build.html_dom_signature(result) != build.html_dom_signature(content):
+            failed.append(name)
+        original += len(content.encode('utf-8'))
+        minified += len(result.encode('utf-8'))
+    elapsed = time.perf_counter() - start
+
+    # La verificación tiene que notar un cambio dentro de un pre-wrap
+    page = documents[1][1]
+    altered = page.replace('\n\n   Goles:', '\nGoles:', 1)
+    detects_changes = altered != page and build.html_dom_signature(altered) != build.html_dom_signature(page)
+    ampersand = dict(documents)['ampersand.html']
+    keeps_ampersand = build.minify_html(ampersand) == '<p class="card-text">Q&amp;A con Diego &amp; el plantel</p>'
+
+    saved = original - minified
+    print(f"   {build.format_bytes(original)} → {build.format_bytes(minified)} "
+          f"(ahorro de {build.format_bytes(saved)}, {100 * saved / original:.0f}%)")
+    print(f"   {elapsed * 1000:.2f} ms ({elapsed / len(documents) * 1e6:.0f} µs/página, incluye la verificación)")
+    if failed or not detects_changes or not keeps_ampersand:
+        for name in failed:
+            print(f"   ✗ El DOM cambió al minificar {name}")
+        if not detects_changes:
+            print("   ✗ La verificación no detectó un cambio en una descripción pre-wrap")
+        if not keeps_ampersand:
+            print("   ✗ Un & suelto no se escapó como &amp; al minificar")
+        return None
+    print(f"   ✓ DOM sin cambios en las {len(documents)} páginas")
+    return {'pages': len(documents), 'original': original, 'minified': minified, 'seconds': elapsed}
+
+def bench_suite(args):
+    """Corre todas las fases del build sobre feeds sintéticos y devuelve los resultados"""
+    timer = PhaseTimer()
+    channel_info = {'filter_keywords': True, 'name': 'Canal sintético'}
+    counts = {}
+
+    with tempfile.TemporaryDirectory(prefix='instituto-bench-') as workdir:
+        workdir = Path(workdir)
+        feeds_dir = workdir / 'feeds'
+        output_dir = workdir / 'docs'
+        (feeds_dir / 'youtube').mkdir(parents=True)
+        output_dir.mkdir()
+
+        print(f"⏱️  Suite: {args.items} items, {args.body_size} B por cuerpo, "
+              f"{args.channels} canales x {args.entries} videos")
+
+        # Preparación (no cuenta en el total)
+        start = time.perf_counter()
+        wordpress_feed = feeds_dir / 'feed-general.xml'
+        generate_wordpress_feed(wordpress_feed, args.items, args.body_size, args.seed)
+        youtube_feeds = []
+        for channel in range(args.channels):
+            feed_file = feeds_dir / 'youtube' / f'canal{channel}.xml'
+            generate_youtube_feed(feed_file, args.entries, channel, args.seed)
+            youtube_feeds.append(feed_file)
+        setup_seconds = time.perf_counter() - start
+        print(f"   (feeds sintéticos generados en {setup_seconds * 1000:.2f} ms)")
+
+        with timer.phase('parse_feed'):
+            noticias = build.parse_feed(wordpress_feed, limit=build.LIMITE_NOTICIAS)
+            fotos = build.parse_feed(wordpress_feed, limit=build.LIMITE_FOTOS, require_image=True)
+        counts['noticias'] = len(noticias)
+
+        # Parseo sin filtrar, así el filtrado se mide por separado
+        with timer.phase('parse_youtube_feed'):
+            all_videos = []
+            for feed_file in youtube_feeds:
+                all_videos.extend(build.parse_youtube_feed(
+                    feed_file, {**channel_info, 'filter_keywords': False}, limit=args.entries
+                ))
+        counts['videos_parseados'] = len(all_videos)
+
+        with timer.phase('filtrado_keywords'):
+            filtered = [video for video in all_videos if build.title_matches_keywords(video['title'])]
+        counts['videos_filtrados'] = len(filtered)
+
+        with timer.phase('ordenar_videos'):
+            filtered.sort(key=lambda video: video['pub_date_raw'], reverse=True)
+            videos = filtered[:args.pages]
+        counts['paginas_video'] = len(videos)
+
+        # Camino real del build: parseo perezoso + merge hasta LIMITE_VIDEOS
+        with timer.phase('merge_videos'):
+            latest = build.merge_latest_videos({
+                index: build.parse_youtube_feed(feed_file, channel_info, limit=args.entries)
+                for index, feed_file in enumerate(youtube_feeds)
+            }, build.LIMITE_VIDEOS)
+        counts['videos_merge'] = len(latest)
+        # Cada video tiene que quedar asociado al canal del que salió
+        mislabeled = [video['video_id'] for index, video in latest if video['video_id'][1:5] != f'{index:04d}']
+        if mislabeled:
+            raise RuntimeError(f"merge_latest_videos asoció {len(mislabeled)} videos al canal equivocado")
+
+        stylesheet_href = build.stylesheet_url()
+        with timer.phase('generate_html'):
+            index_html = build.generate_html(noticias, fotos, [], videos[:build.LIMITE_VIDEOS], stylesheet_href)
+
+        with timer.phase('generate_video_page'):
+            pages = [
+                (build.create_slug(video['title']), video)
+                for video in videos
+            ]
+            rendered = [
+                (slug, build.generate_video_page(video, slug, stylesheet_href))
+                for slug, video in pages
+            ]
+
+        with timer.phase('escritura_disco'):
+            build.write_if_changed(output_dir / 'index.html', index_html)
+            for slug, page_html in rendered:
+                build.write_if_changed(output_dir / 'videos' / slug / 'index.html', page_html)
+
+        with timer.phase('escritura_disco_sin_cambios'):
+            build.write_if_changed(output_dir / 'index.html', index_html)
+            for slug, page_html in rendered:
+                build.write_if_changed(output_dir / 'videos' / slug / 'index.html', page_html)
+
+        with timer.phase('sitemap'):
+            sitemap_pages = [
+                {'slug': slug, 'published': video['pub_date_raw'],
+                 'first_seen': video['pub_date_raw'], 'modified': None}
+                for slug, video in reversed(pages)
+            ]
+            build.generate_sitemap(output_dir, 'https://instituto.com.ar', sitemap_pages)
+
+    return {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'python': platform.python_version(),
+        'params': {
+            'items': args.items,
+            'body_size': args.body_size,
+            'channels': args.channels,
+            'entries': args.entries,
+            'pages': args.pages,
+            'seed': args.seed
+        },
+        'counts': counts,
+        'setup_seconds': setup_seconds,
+        'phases': timer.phases,
+        'total': sum(timer.phases.values())
+    }
+
+def compare_results(before_file, after_file):
+    """Compara dos resultados JSON de la suite fase por fase"""
+    before = json.loads(Path(before_file).read_text(encoding='utf-8'))
+    after = json.loads(Path(after_file).read_text(encoding='utf-8'))
+
+    if before['params'] != after['params']:
+        print("⚠ Las corridas usan parámetros distintos, la comparación puede no ser válida")
+
+    print(f"   {'fase':<28} {'antes (ms)':>11} {'después (ms)':>13} {'cambio':>8}")
+    phases = list(before['phases']) + [name for name in after['phases'] if name not in before['phases']]
+    for name in phases + ['total']:
+        old = before['total'] if name == 'total' else before['phases'].get(name)
+        new = after['total'] if name == 'total' else after['phases'].get(name)
+        if old is None or new is None:
+            print(f"   {name:<28} {'-' if old is None else f'{old * 1000:.2f}':>11} "
+                  f"{'-' if new is None else f'{new * 1000:.2f}':>13}")
+            continue
+        change = f"{(new - old) / old * 100:+.1f}%" if old else '-'
+        print(f"   {name:<28} {old * 1000:>11.2f} {new * 1000:>13.2f} {change:>8}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmarks de build.py')
+    subparsers = parser.add_subparsers(dest='benchmark', required=True)
+
+    suite_parser = subparsers.add_parser('suite', help='Tiempos de cada fase del build con feeds sintéticos')
+    suite_parser.add_argument('--items', type=int, default=50, help='Items del feed de WordPress')
+    suite_parser.add_argument('--body-size', type=int, default=20000,
+                              help='Bytes aproximados de content:encoded por item')
+    suite_parser.add_argument('--channels', type=int, default=13, help='Canales de YouTube (ej: 10 a 1000)')
+    suite_parser.add_argument('--entries', type=int, default=15, help='Videos por canal')
+    suite_parser.add_argument('--pages', type=int, default=200, help='Páginas de video a generar')
+    suite_parser.add_argument('--seed', type=int, default=0, help='Semilla de los datos sintéticos')
+    suite_parser.add_argument('--output', help='Archivo JSON donde guardar los resultados')
+
+    compare_parser = subparsers.add_parser('compare', help='Compara dos resultados JSON de la suite')
+    compare_parser.add_argument('before')
+    compare_parser.add_argument('after')
+
+    render_parser = subparsers.add_parser('render', help='Escalabilidad del render de index.html')
+    render_parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000],
+                               help='Cantidades de items por sección')
+
+    keywords_parser = subparsers.add_parser('keywords', help='Filtro de títulos por palabras clave')
+    keywords_parser.add_argument('--titles', type=int, default=100000, help='Cantidad de títulos')
+    keywords_parser.add_argument('--keywords', nargs='+', help='Palabras clave (por defecto VIDEO_FILTER_KEYWORDS)')
+    keywords_parser.add_argument('--seed', type=int, default=0, help='Semilla de los datos sintéticos')
+
+    minify_parser = subparsers.add_parser('minify', help='Minificación de HTML (tamaños y verificación del DOM)')
+    minify_parser.add_argument('--pages', type=int, default=200, help='Páginas de video sintéticas')
+    minify_parser.add_argument('files', nargs='*', help='Archivos HTML adicionales (ej: docs/index.html)')
+
+    args = parser.parse_args()
+
+    # Mostrar todas las secciones aunque estén deshabilitadas en config.py
+    build.MOSTRAR_VIDEOS = build.MOSTRAR_NOTICIAS = build.MOSTRAR_FOTOS = build.MOSTRAR_AGENDA = True
+
+    if args.benchmark == 'render':
+        bench_render(args.sizes)
+    elif args.benchmark == 'suite':
+        results = bench_suite(args)
+        print(f"   {'total':<28} {results['total'] * 1000:>10.2f} ms")
+        if args.output:
+            Path(args.output).write_text(json.dumps(results, indent=2), encoding='utf-8')
+            print(f"✓ Resultados guardados en {args.output}")
+    elif args.benchmark == 'keywords':
+        bench_keywords(args.titles, args.keywords, seed=args.seed)
+    elif args.benchmark == 'compare':
+        compare_results(args.before, args.after)
+    elif args.benchmark == 'minify':
+        if bench_minify(args.pages, args.files) is None:
+            sys.exit(1)
+
+if __name__ == '__main__':
+    main()
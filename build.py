@@ -4,82 +4,745 @@ Generador de sitio estático para Instituto
 Lee feeds RSS del sitio oficial y genera un sitio HTML estático
 """
 import xml.etree.ElementTree as ET
+import xml.parsers.expat
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from datetime import datetime
 from pathlib import Path
 import re
+import argparse
+import codecs
+import contextlib
+import functools
+import gzip
+import hashlib
+import heapq
 import html
+import html.parser
+import http.server
+import importlib
+import importlib.util
+import inspect
+import itertools
+import json
+import mimetypes
+import os
+import random
+import sqlite3
+import string
+import sys
+import threading
+import time
+import traceback
+import urllib.parse
 import urllib.request
 import urllib.error
 import unicodedata
+import zlib
+
+try:
+    from PIL import Image, ImageOps  # Opcional: solo para CACHE_IMAGENES
+except ImportError:
+    Image = ImageOps = None
+
+try:
+    import brotli  # Opcional: variantes .br de PRECOMPRIMIR
+except ImportError:
+    brotli = None
 
 # Importar configuración (si existe, sino usar valores por defecto)
 from config import *
+import config
 
+# Lock para que los mensajes de los threads de descarga no se mezclen
+_print_lock = threading.Lock()
 
-def download_feed(url, output_path):
-    """Descarga un feed RSS desde una URL y lo guarda localmente"""
-    if not DOWNLOAD_FEED:
-        print(f"  → Omitiendo descarga de feed (DOWNLOAD_FEED=False)")
-        return False
 
+def log(message):
+    """Imprime una línea de progreso de forma segura entre threads"""
+    with _print_lock:
+        print(message, flush=True)
+
+class BuildProfiler:
+    """Registra la duración de cada fase del build (modo --profile)
+
+    Deshabilitado no mide nada, así el build normal no paga el costo.
+    """
+
+    def __init__(self, enabled=False):
+        self.enabled = enabled
+        self.started = time.perf_counter()
+        self.records = []
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def phase(self, name, **details):
+        """Mide un bloque de código como una fase (ej: with PROFILER.phase('parse_feed'))"""
+        if not self.enabled:
+            yield
+            return
+
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._add(name, start, time.perf_counter() - start, details)
+
+    def iterate(self, name, iterable, **details):
+        """Mide el tiempo total que se pasa generando los elementos de un iterable
+
+        Sirve para generadores que se consumen de a poco (ej: un canal dentro
+        del merge de videos). La medición se registra al terminar o cerrarse.
+        """
+        if not self.enabled:
+            return iterable
+        return self._iterate(name, iterable, details)
+
+    def _iterate(self, name, iterable, details):
+        iterator = iter(iterable)
+        first_start = time.perf_counter()
+        elapsed = 0.0
+        count = 0
+        try:
+            while True:
+                start = time.perf_counter()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    break
+                finally:
+                    elapsed += time.perf_counter() - start
+                count += 1
+                yield item
+        finally:
+            if hasattr(iterator, 'close'):
+                iterator.close()
+            self._add(name, first_start, elapsed, {'items': count, **details})
+
+    def _add(self, name, start, seconds, details):
+        record = {
+            'phase': name,
+            'start': round(start - self.started, 6),
+            'seconds': round(seconds, 6),
+            'thread': threading.current_thread().name,
+            **details
+        }
+        with self._lock:
+            self.records.append(record)
+
+    def report(self):
+        """Arma el reporte: cada medición y los totales por fase"""
+        totals = {}
+        for record in self.records:
+            total = totals.setdefault(record['phase'], {'count': 0, 'seconds': 0.0})
+            total['count'] += 1
+            total['seconds'] = round(total['seconds'] + record['seconds'], 6)
+
+        return {
+            'timestamp': datetime.now().isoformat(timespec='seconds'),
+            'total_seconds': round(time.perf_counter() - self.started, 6),
+            'phases': totals,
+            'records': self.records
+        }
+
+    def write_report(self, report_file):
+        Path(report_file).write_text(json.dumps(self.report(), indent=2, ensure_ascii=False), encoding='utf-8')
+
+    def print_summary(self, top=5):
+        """Muestra las fases y las mediciones individuales más lentas"""
+        report = self.report()
+        print(f"\n⏱️  Perfil del build ({report['total_seconds'] * 1000:.0f} ms en total)")
+        for name, total in sorted(report['phases'].items(), key=lambda item: -item[1]['seconds']):
+            print(f"   {name:<22} {total['seconds'] * 1000:>9.1f} ms  ({total['count']}x)")
+
+        print("   Más lentas:")
+        for record in sorted(self.records, key=lambda record: -record['seconds'])[:top]:
+            details = ', '.join(f"{key}={value}" for key, value in record.items()
+                                if key not in ('phase', 'start', 'seconds', 'thread'))
+            print(f"   {record['phase']:<22} {record['seconds'] * 1000:>9.1f} ms  {details}")
+
+# Perfilador global (se habilita con --profile)
+PROFILER = BuildProfiler()
+
+# Tamaño de los pedazos leídos de cada respuesta HTTP
+DOWNLOAD_CHUNK_SIZE = 64 * 1024
+
+# Tamaño de los pedazos al leer feeds cacheados
+FEED_READ_CHUNK_SIZE = 16 * 1024
+
+# Tamaño máximo de cada archivo del sitemap (límite del protocolo: 50 MB)
+SITEMAP_MAX_BYTES = 50 * 1024 * 1024
+
+# Catálogo persistente de videos (SQLite)
+VIDEO_CATALOG_FILE = Path('feeds') / 'videos.sqlite3'
+CATALOG_PAGE_SIZE = 500  # Videos por consulta al recorrer el catálogo
+
+# Huella de las entradas del último build (para saltear builds sin cambios)
+BUILD_FINGERPRINT_FILE = Path('feeds') / 'build-fingerprint.json'
+
+# Items normalizados de la etapa fetch (los lee la etapa render)
+ITEM_STORE_FILE = Path('feeds') / 'items.json'
+
+# Caché de imágenes de noticias y fotos (originales con el hash de su
+# contenido como nombre) y carpeta de docs/ con las copias achicadas
+IMAGE_CACHE_DIR = Path('feeds') / 'images'
+IMAGE_CACHE_INDEX = IMAGE_CACHE_DIR / 'index.json'
+IMAGE_OUTPUT_DIR = Path('imgs') / 'cache'
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.gif'}
+
+# Archivos de docs/ que se precomprimen con PRECOMPRIMIR
+PRECOMPRESS_EXTENSIONS = {'.html', '.xml', '.css', '.js', '.json', '.txt', '.svg'}
+PRECOMPRESS_SUFFIXES = ('.gz', '.br')
+
+# Servidor de desarrollo (build.py serve)
+DEV_SERVER_PORT = 8000
+DEV_SERVER_RELOAD_PATH = '/__reload'
+DEV_SERVER_WATCH_INTERVAL = 0.25  # Segundos entre chequeos de cambios en los archivos
+
+# Hash de dependencias de cada archivo generado (para regenerar solo lo que cambió)
+OUTPUT_MANIFEST_FILE = Path('feeds') / 'outputs-manifest.json'
+
+# Código de salida cuando no hay cambios y no se generó nada
+EXIT_SIN_CAMBIOS = 3
+
+# Resultados posibles de download_feed (False si no se descargó)
+DESCARGA_NUEVA = 'nuevo'
+DESCARGA_SIN_CAMBIOS = 'sin_cambios'
+DESCARGA_CACHE = 'cache'  # Falló la descarga y se usa la última copia guardada
+
+# Timeout mínimo de un pedido y espera base entre reintentos (segundos)
+DESCARGA_TIMEOUT_MINIMO = 3
+DESCARGA_ESPERA_REINTENTO = 0.5
+
+# Errores HTTP que vale la pena reintentar
+HTTP_REINTENTABLES = {408, 425, 429, 500, 502, 503, 504}
+
+
+def feed_metadata_path(output_path):
+    """Ruta del archivo con los validadores HTTP (ETag / Last-Modified) de un feed"""
+    output_path = Path(output_path)
+    return output_path.with_name(output_path.name + '.meta.json')
+
+def load_feed_metadata(output_path):
+    """Lee los validadores HTTP guardados junto al feed
+
+    Solo son válidos si el feed cacheado todavía existe.
+    """
+    meta_file = feed_metadata_path(output_path)
+    if not Path(output_path).exists() or not meta_file.exists():
+        return {}
     try:
-        print(f"  → Descargando desde {url}...")
-
-        # Configurar headers para simular un navegador
-        req = urllib.request.Request(
-            url,
-            headers={
-                'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36'
-            }
-        )
+        return json.loads(meta_file.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+
+def save_feed_metadata(output_path, headers):
+    """Guarda ETag y Last-Modified de la respuesta junto al feed"""
+    metadata = {}
+    if headers.get('ETag'):
+        metadata['etag'] = headers['ETag']
+    if headers.get('Last-Modified'):
+        metadata['last_modified'] = headers['Last-Modified']
+
+    meta_file = feed_metadata_path(output_path)
+    if metadata:
+        meta_file.write_text(json.dumps(metadata, indent=2), encoding='utf-8')
+    elif meta_file.exists():
+        meta_file.unlink()
+
+class StreamDecompressor:
+    """Descomprime de a pedazos una respuesta HTTP según su Content-Encoding
+
+    Soporta gzip y deflate (con o sin encabezado zlib). Con identity los
+    datos pasan sin cambios.
+    """
 
-        # Descargar el contenido
-        with urllib.request.urlopen(req, timeout=30) as response:
-            content = response.read().decode('utf-8')
+    def __init__(self, content_encoding):
+        self.content_encoding = (content_encoding or 'identity').strip().lower()
+        if self.content_encoding not in ('identity', 'gzip', 'x-gzip', 'deflate'):
+            raise ValueError(f"Content-Encoding no soportado: {self.content_encoding}")
+        self._decompressor = None
+        if self.content_encoding in ('gzip', 'x-gzip'):
+            self._decompressor = zlib.decompressobj(16 + zlib.MAX_WBITS)
+
+    def decompress(self, chunk):
+        if self.content_encoding == 'identity' or not chunk:
+            return chunk
+        if self._decompressor is None:
+            # Algunos servidores mandan deflate "crudo" sin encabezado zlib
+            has_zlib_header = (
+                len(chunk) >= 2 and (chunk[0] & 0x0F) == 8 and ((chunk[0] << 8) | chunk[1]) % 31 == 0
+            )
+            wbits = zlib.MAX_WBITS if has_zlib_header else -zlib.MAX_WBITS
+            self._decompressor = zlib.decompressobj(wbits)
+        return self._decompressor.decompress(chunk)
+
+    def flush(self):
+        if self._decompressor is None:
+            return b''
+        return self._decompressor.flush()
+
+def format_bytes(size):
+    """Formatea una cantidad de bytes en forma legible (ej: 12.3 KB)"""
+    if size < 1024:
+        return f"{size} B"
+    if size < 1024 * 1024:
+        return f"{size / 1024:.1f} KB"
+    return f"{size / (1024 * 1024):.1f} MB"
+
+class FetchPolicy:
+    """Límites de tiempo compartidos por todas las descargas de un build
+
+    - Plazo total: ningún pedido arranca (ni espera) más allá de él.
+    - Timeout adaptativo: se calcula por servidor a partir de lo que
+      tardaron sus respuestas anteriores (promedio móvil), entre
+      DESCARGA_TIMEOUT_MINIMO y el timeout máximo.
+    - Reintentos acotados con espera exponencial y jitter, para que los
+      reintentos de varios feeds no lleguen todos juntos.
+    """
 
-        # Guardar el archivo
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(content)
+    def __init__(self, deadline=None, max_timeout=None, retries=None):
+        self.deadline = time.monotonic() + (deadline or DESCARGAS_PLAZO_TOTAL)
+        self.max_timeout = max_timeout or DESCARGAS_TIMEOUT
+        self.retries = DESCARGAS_REINTENTOS if retries is None else retries
+        self._latency = {}
+        self._lock = threading.Lock()
+
+    def remaining(self):
+        return max(0.0, self.deadline - time.monotonic())
+
+    def timeout_for(self, host):
+        """Timeout para el próximo pedido a `host` (0 si ya no queda plazo)"""
+        with self._lock:
+            latency = self._latency.get(host)
+        timeout = self.max_timeout if latency is None else min(self.max_timeout, max(DESCARGA_TIMEOUT_MINIMO, latency * 4))
+        return min(timeout, self.remaining())
+
+    def record(self, host, seconds):
+        """Registra cuánto tardó una respuesta completa de `host`"""
+        with self._lock:
+            previous = self._latency.get(host)
+            self._latency[host] = seconds if previous is None else 0.7 * previous + 0.3 * seconds
+
+    def backoff(self, attempt, retry_after=None):
+        """Espera antes del reintento `attempt` (None si no alcanza el plazo)"""
+        delay = random.uniform(0, DESCARGA_ESPERA_REINTENTO * 2 ** attempt)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        if delay >= self.remaining():
+            return None
+        return delay
+
+def retry_after_seconds(error):
+    """Segundos pedidos por el servidor en Retry-After (solo el formato numérico)"""
+    value = error.headers.get('Retry-After') if error.headers else None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
 
-        print(f"  ✓ Guardado en {output_path}")
-        return True
+class XMLChecker:
+    """Verifica de a pedazos que un documento sea XML completo y bien formado
 
-    except urllib.error.URLError as e:
-        print(f"  ✗ Error al descargar: {e}")
-        return False
-    except Exception as e:
-        print(f"  ✗ Error inesperado: {e}")
+    Usa expat sin armar ningún árbol, así se puede revisar todo el feed
+    mientras se descarga sin volver a leerlo del disco. Igual que
+    iter_feed_elements(), ignora lo que haya antes de `<?xml`.
+    """
+
+    def __init__(self):
+        self._parser = xml.parsers.expat.ParserCreate()
+        self._head = ''
+        self._started = False
+
+    def feed(self, text):
+        if not self._started:
+            self._head += text
+            if '<?xml' not in self._head and len(self._head) < FEED_READ_CHUNK_SIZE:
+                return
+            xml_start = self._head.find('<?xml')
+            text = self._head[xml_start:] if xml_start > 0 else self._head
+            self._started = True
+        self._parse(text, False)
+
+    def close(self):
+        """Termina la verificación
+
+        Raises:
+            ET.ParseError si el XML está cortado o mal formado
+        """
+        if not self._started:
+            self._started = True
+            self._parse(self._head, False)
+        self._parse('', True)
+
+    def _parse(self, text, final):
+        try:
+            self._parser.Parse(text, final)
+        except xml.parsers.expat.ExpatError as e:
+            raise ET.ParseError(str(e)) from None
+
+class FeedParser:
+    """Parseo de un feed durante su descarga, o desde la caché si no hubo descarga
+
+    download_feed() le pasa el texto a medida que llega de la red (ver
+    fetch_feed), así los items están listos apenas llegan sus bytes y el
+    parseo se superpone con la descarga de los demás feeds. Si el feed no
+    se descargó (304, error, DOWNLOAD_FEED=False) se parsea el archivo
+    cacheado al pedir el resultado.
+
+    Args:
+        parse: Función que recibe un iterable de pedazos de texto del XML
+        feed_file: Feed cacheado
+    """
+
+    def __init__(self, parse, feed_file):
+        self.parse = parse
+        self.feed_file = Path(feed_file)
+        self.result = None
+        self.done = False
+
+    def consume(self, chunks):
+        """Parsea los pedazos de texto a medida que llegan"""
+        self.result = self.parse(chunks)
+        self.done = True
+
+    def reset(self):
+        """Descarta el resultado (ej: la descarga falló después de parsear)"""
+        self.result = None
+        self.done = False
+
+    def parsed(self):
+        """Resultado del parseo (si no se hizo durante la descarga, lee la caché)"""
+        if not self.done:
+            self.consume(read_feed_chunks(self.feed_file))
+        return self.result
+
+# encoding="..." de la declaración <?xml ...?>
+XML_DECLARATION_ENCODING = re.compile(r'''(<\?xml[^>]*?\bencoding\s*=\s*)(["'])[^"']*\2''')
+
+def utf8_declaration(chunks):
+    """Reescribe como utf-8 el encoding que declara un documento XML
+
+    Los feeds se guardan siempre en UTF-8 (ver fetch_feed): si la
+    declaración original (ej: encoding="iso-8859-1") quedara, quien lea el
+    archivo confiando en ella mostraría mal los acentos. Solo se retiene el
+    comienzo del documento hasta ver la declaración; el resto pasa igual.
+    """
+    chunks = iter(chunks)
+    head = ''
+    for chunk in chunks:
+        head += chunk
+        start = head.find('<?xml')
+        if (start >= 0 and '?>' in head[start:]) or len(head) >= FEED_READ_CHUNK_SIZE:
+            break
+    if head:
+        yield XML_DECLARATION_ENCODING.sub(r'\1\2utf-8\2', head, count=1)
+    yield from chunks
+
+def fetch_feed(url, output_path, headers, timeout, parser=None):
+    """Hace un pedido y guarda la respuesta de forma atómica
+
+    El contenido se descomprime y decodifica de a pedazos y cada pedazo va
+    a la vez a un archivo temporal, a un XMLChecker y (si se pasa) al
+    `parser`. Recién cuando el XML llegó completo y bien formado el temporal
+    reemplaza al feed cacheado: un corte a mitad de la descarga nunca pisa
+    una copia buena. Como el archivo se guarda en UTF-8, la declaración
+    `<?xml ... encoding=...?>` se reescribe (ver utf8_declaration).
+
+    Args:
+        timeout: Segundos máximos para todo el pedido (no solo por lectura)
+        parser: FeedParser a alimentar mientras llegan los datos
+
+    Returns:
+        Tupla (headers de la respuesta, bytes recibidos, bytes sin comprimir,
+        decompressor, charset)
+    """
+    output_path = Path(output_path)
+    temp_path = output_path.with_name(output_path.name + '.tmp')
+    request_deadline = time.monotonic() + timeout
+    compressed_size = 0
+    uncompressed_size = 0
+
+    req = urllib.request.Request(url, headers=headers)
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as response:
+            response_headers = response.headers
+            decompressor = StreamDecompressor(response_headers.get('Content-Encoding'))
+            charset = response_headers.get_content_charset() or 'utf-8'
+            decoder = codecs.getincrementaldecoder(charset)(errors='replace')
+            checker = XMLChecker()
+
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                def decoded_chunks():
+                    nonlocal compressed_size, uncompressed_size
+                    while True:
+                        if time.monotonic() > request_deadline:
+                            raise TimeoutError(f"la descarga superó {timeout:.0f} s")
+                        chunk = response.read(DOWNLOAD_CHUNK_SIZE)
+                        if not chunk:
+                            break
+                        compressed_size += len(chunk)
+                        data = decompressor.decompress(chunk)
+                        uncompressed_size += len(data)
+                        text = decoder.decode(data)
+                        if text:
+                            yield text
+
+                    data = decompressor.flush()
+                    uncompressed_size += len(data)
+                    text = decoder.decode(data, final=True)
+                    if text:
+                        yield text
+
+                def text_chunks():
+                    for text in utf8_declaration(decoded_chunks()):
+                        f.write(text)
+                        checker.feed(text)
+                        yield text
+
+                chunks = text_chunks()
+                if parser is not None:
+                    parser.consume(chunks)
+                # El parser puede dejar de leer antes: el resto igual va a la caché
+                for _ in chunks:
+                    pass
+
+            checker.close()
+        os.replace(temp_path, output_path)
+    except BaseException:
+        if parser is not None:
+            parser.reset()
+        raise
+    finally:
+        if temp_path.exists():
+            temp_path.unlink()
+
+    return response_headers, compressed_size, uncompressed_size, decompressor, charset
+
+def download_feed(url, output_path, policy=None, parser=None):
+    """Descarga un feed RSS desde una URL y lo guarda localmente
+
+    Usa GET condicional (If-None-Match / If-Modified-Since) con los
+    validadores de la descarga anterior. Si el servidor responde 304 se
+    conserva el archivo cacheado.
+
+    Pide la respuesta comprimida (gzip/deflate) y la descomprime de a
+    pedazos. El texto se decodifica con el charset que declara el servidor
+    y siempre se guarda en UTF-8, reemplazando al feed cacheado solo si el
+    XML llegó completo (ver fetch_feed).
+
+    Los errores de red, timeouts, XML cortado y errores 5xx/429 se
+    reintentan según `policy`. Si igual falla, queda la última copia buena.
+
+    Args:
+        policy: FetchPolicy compartida (default: una nueva con config.py)
+        parser: FeedParser que parsea el feed mientras se descarga
+
+    Returns:
+        DESCARGA_NUEVA si se guardó contenido nuevo,
+        DESCARGA_SIN_CAMBIOS si el feed no cambió desde la última descarga,
+        DESCARGA_CACHE si falló pero hay una copia anterior guardada,
+        False si no se pudo descargar y no hay caché
+    """
+    if not DOWNLOAD_FEED:
+        log(f"  → Omitiendo descarga de feed (DOWNLOAD_FEED=False)")
         return False
 
+    policy = policy or FetchPolicy()
+    host = urllib.parse.urlparse(url).netloc
+    log(f"  → Descargando desde {url}...")
+
+    # Configurar headers para simular un navegador
+    headers = {
+        'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36',
+        'Accept-Encoding': 'gzip, deflate'
+    }
+
+    # Validadores de la descarga anterior (si hay caché)
+    metadata = load_feed_metadata(output_path)
+    if metadata.get('etag'):
+        headers['If-None-Match'] = metadata['etag']
+    if metadata.get('last_modified'):
+        headers['If-Modified-Since'] = metadata['last_modified']
+
+    for attempt in range(policy.retries + 1):
+        timeout = policy.timeout_for(host)
+        if timeout <= 0:
+            log(f"  ✗ Sin tiempo para descargar {url} (plazo total agotado)")
+            break
+
+        retry_after = None
+        start = time.monotonic()
+        try:
+            response_headers, compressed_size, uncompressed_size, decompressor, charset = fetch_feed(
+                url, output_path, headers, timeout, parser
+            )
+            policy.record(host, time.monotonic() - start)
+            save_feed_metadata(output_path, response_headers)
+
+            if decompressor.content_encoding == 'identity':
+                log(f"  ✓ Guardado en {output_path} ({format_bytes(uncompressed_size)} sin comprimir)")
+            else:
+                log(f"  ✓ Guardado en {output_path} ({format_bytes(compressed_size)} {decompressor.content_encoding} → "
+                    f"{format_bytes(uncompressed_size)}, charset {charset})")
+            return DESCARGA_NUEVA
+
+        except urllib.error.HTTPError as e:
+            if e.code == 304:
+                policy.record(host, time.monotonic() - start)
+                log(f"  ✓ Sin cambios, se usa la caché {output_path}")
+                return DESCARGA_SIN_CAMBIOS
+            log(f"  ✗ Error al descargar {url}: {e}")
+            if e.code not in HTTP_REINTENTABLES:
+                break
+            retry_after = retry_after_seconds(e)
+        except (urllib.error.URLError, OSError, ET.ParseError) as e:
+            # URLError, timeouts, conexiones cortadas y XML incompleto
+            log(f"  ✗ Error al descargar {url}: {e}")
+        except Exception as e:
+            log(f"  ✗ Error inesperado con {url}: {e}")
+            break
+
+        if attempt < policy.retries:
+            delay = policy.backoff(attempt, retry_after)
+            if delay is None:
+                log(f"  ✗ Sin tiempo para reintentar {url} (plazo total agotado)")
+                break
+            log(f"  ↻ Reintentando {url} en {delay:.1f} s ({attempt + 1}/{policy.retries})")
+            time.sleep(delay)
+
+    if Path(output_path).exists():
+        log(f"  ⚠ Se usa la última copia guardada de {output_path}")
+        return DESCARGA_CACHE
+    return False
+
+def download_feeds(jobs, max_workers=None, max_per_host=None, parsers=None):
+    """Descarga varios feeds en paralelo usando un pool de threads
+
+    El tiempo total queda determinado por el feed más lento y no por la
+    suma de todos.
+
+    Args:
+        jobs: Dict {clave: (url, output_path)}
+        max_workers: Descargas simultáneas en total (default: DESCARGAS_CONCURRENTES)
+        max_per_host: Conexiones simultáneas por servidor (default: DESCARGAS_POR_HOST)
+        parsers: Dict {clave: FeedParser} de los feeds a parsear mientras se descargan
+
+    Returns:
+        Dict {clave: resultado de download_feed}
+    """
+    if not jobs:
+        return {}
+
+    max_workers = max_workers or DESCARGAS_CONCURRENTES
+    max_per_host = max_per_host or DESCARGAS_POR_HOST
+
+    # Un semáforo por servidor para no saturar a un mismo host
+    host_limits = {}
+    for url, _ in jobs.values():
+        host = urllib.parse.urlparse(url).netloc
+        host_limits.setdefault(host, threading.BoundedSemaphore(max_per_host))
+
+    # Un solo plazo total para todas las descargas
+    policy = FetchPolicy()
+
+    parsers = parsers or {}
+
+    def fetch(url, output_path, parser):
+        with host_limits[urllib.parse.urlparse(url).netloc]:
+            with PROFILER.phase('download', feed=str(output_path)):
+                return download_feed(url, output_path, policy, parser)
+
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(jobs))) as executor:
+        futures = {
+            key: executor.submit(fetch, url, output_path, parsers.get(key))
+            for key, (url, output_path) in jobs.items()
+        }
+        return {key: future.result() for key, future in futures.items()}
+
+def read_feed_chunks(feed_file, chunk_size=None):
+    """Lee un feed cacheado de a pedazos de texto"""
+    chunk_size = chunk_size or FEED_READ_CHUNK_SIZE
+    with open(feed_file, 'r', encoding='utf-8') as f:
+        while True:
+            chunk = f.read(chunk_size)
+            if not chunk:
+                break
+            yield chunk
+
+def iter_feed_elements(chunks, tag):
+    """Parsea XML de forma incremental y devuelve cada elemento `tag` completo
+
+    Los datos se procesan a medida que llegan (de un archivo o de la red) y
+    cada elemento se limpia y se desprende del árbol después de usarlo, así
+    la memoria no crece con el tamaño del feed. Si quien consume deja de
+    iterar, no se lee el resto del documento.
+
+    Args:
+        chunks: Iterable de pedazos de texto del documento XML
+        tag: Tag a devolver (con namespace si corresponde, ej: '{...}entry')
+    """
+    parser = ET.XMLPullParser(events=('start', 'end'))
+    stack = []
+
+    def feed(data):
+        parser.feed(data)
+        for event, elem in parser.read_events():
+            if event == 'start':
+                stack.append(elem)
+                continue
+
+            stack.pop()
+            if elem.tag == tag:
+                yield elem
+                # Liberar el elemento ya procesado
+                elem.clear()
+                if stack:
+                    stack[-1].remove(elem)
+
+    head = ''
+    started = False
+    for chunk in chunks:
+        if not started:
+            # Encontrar el inicio del XML y eliminar espacios/líneas previas
+            head += chunk
+            if '<?xml' not in head and len(head) < FEED_READ_CHUNK_SIZE:
+                continue
+            xml_start = head.find('<?xml')
+            chunk = head[xml_start:] if xml_start > 0 else head
+            started = True
+        yield from feed(chunk)
+
+    if not started:
+        yield from feed(head)
+    parser.close()
+
 def parse_feed(feed_file, limit=3, require_image=False):
     """Parsea un feed RSS y retorna los primeros N items
 
+    El feed se lee de forma incremental y se deja de leer apenas se
+    juntan los items necesarios.
+
     Args:
         feed_file: Ruta al archivo XML del feed
         limit: Cantidad máxima de items a retornar
         require_image: Si es True, solo retorna items que tengan imágenes
     """
-    # Leer y limpiar el archivo XML
-    with open(feed_file, 'r', encoding='utf-8') as f:
-        content = f.read()
-
-    # Encontrar el inicio del XML y eliminar espacios/líneas previas
-    xml_start = content.find('<?xml')
-    if xml_start > 0:
-        content = content[xml_start:]
-
-    # Parsear el XML limpio
-    root = ET.fromstring(content)
+    return parse_feed_chunks(read_feed_chunks(feed_file), limit, require_image)
 
+def parse_feed_chunks(chunks, limit=3, require_image=False):
+    """Como parse_feed(), pero recibe el XML en pedazos de texto (ej: de la red)"""
     items = []
     # Si require_image=True, parseamos más items para encontrar suficientes con imágenes
     max_items_to_check = limit * 5 if require_image else limit
 
-    for item in root.findall('.//item')[:max_items_to_check]:
+    feed_items = iter_feed_elements(chunks, 'item')
+    for item in itertools.islice(feed_items, max_items_to_check):
         title = item.find('title').text or ''
         link = item.find('link').text or ''
         description = item.find('description').text or ''
         pub_date = item.find('pubDate').text or ''
+        guid_elem = item.find('guid')
+        guid = guid_elem.text if guid_elem is not None and guid_elem.text else link
 
         # Extraer contenido HTML
         content_elem = item.find('.//{http://purl.org/rss/1.0/modules/content/}encoded')
@@ -100,107 +763,258 @@ def parse_feed(feed_file, limit=3, require_image=False):
             'link': link,
             'description': clean_desc[:MAX_DESCRIPCION] + '...' if len(clean_desc) > MAX_DESCRIPCION else clean_desc,
             'pub_date': format_date(pub_date),
-            'image': image_url
+            'image': image_url,
+            'guid': guid
         })
 
         # Si ya tenemos suficientes items, parar
         if len(items) >= limit:
             break
 
+    feed_items.close()
     return items
 
 
-def parse_youtube_feed(feed_file, channel_info, limit=15):
-    """Parsea un feed Atom de YouTube y retorna videos
+def normalize_keyword_text(text):
+    """Normaliza un texto para comparar palabras clave
 
-    Args:
-        feed_file: Ruta al archivo XML del feed
-        channel_info: Dict con 'filter_keywords', 'name' del canal
-        limit: Videos a buscar antes de filtrar
+    Quita acentos y diferencias de mayúsculas: "La Glória" -> "la gloria",
+    "INSTITUTO" -> "instituto".
+    """
+    text = unicodedata.normalize('NFKD', text)
+    text = ''.join(char for char in text if not unicodedata.combining(char))
+    return text.casefold()
+
+@functools.lru_cache(maxsize=1)
+def accented_variants():
+    """Letras latinas con acento agrupadas por su letra base: {'o': 'óòôöõ...'}"""
+    variants = {}
+    for codepoint in itertools.chain(range(0xC0, 0x250), range(0x1E00, 0x1F00)):
+        char = chr(codepoint)
+        base = normalize_keyword_text(char)
+        if len(base) == 1 and base.isascii() and base.isalpha():
+            variants.setdefault(base, []).append(char)
+    return {base: ''.join(chars) for base, chars in variants.items()}
+
+def keyword_pattern(keywords):
+    """Compila una lista de palabras clave en una sola expresión regular
+
+    Es una alternancia que respeta límites de palabra ("Instituto" no
+    coincide con "Institutos") y acepta cualquier espacio entre palabras.
+    Cada letra acepta también sus variantes acentuadas, así los títulos se
+    buscan tal cual vienen, sin normalizarlos uno por uno.
+    """
+    variants = accented_variants()
+    alternatives = []
+    for keyword in sorted({normalize_keyword_text(keyword).strip() for keyword in keywords}, key=len, reverse=True):
+        words = [
+            ''.join(f'[{char}{variants[char]}]' if char in variants else re.escape(char) for char in word)
+            for word in keyword.split()
+        ]
+        if words:
+            alternatives.append(r'\s+'.join(words))
+    if not alternatives:
+        return None
+    return re.compile(r'(?<!\w)(?:' + '|'.join(alternatives) + r')(?!\w)', re.IGNORECASE)
+
+class KeywordMatcher:
+    """Filtro de títulos por palabras clave, compilado una sola vez
+
+    Un título pasa si contiene alguna palabra de `include` (o si `include`
+    está vacío) y ninguna de `exclude`. La comparación ignora acentos y
+    mayúsculas.
+    """
+
+    def __init__(self, include=(), exclude=()):
+        self.include = keyword_pattern(include)
+        self.exclude = keyword_pattern(exclude)
+
+    def matches(self, title):
+        # Acentos como caracteres combinados ("o" + "´") -> "ó"
+        if not title.isascii() and not unicodedata.is_normalized('NFC', title):
+            title = unicodedata.normalize('NFC', title)
+        if self.exclude and self.exclude.search(title):
+            return False
+        return not self.include or bool(self.include.search(title))
+
+@functools.lru_cache(maxsize=32)
+def compile_keyword_matcher(include=(), exclude=()):
+    """KeywordMatcher cacheado por lista de palabras (se compila una vez por build)"""
+    return KeywordMatcher(include, exclude)
+
+def channel_keyword_matcher(channel_info):
+    """Filtro de títulos de un canal de YOUTUBE_CHANNELS
+
+    Con 'filter_keywords' se exige alguna palabra de 'include_keywords' (por
+    defecto VIDEO_FILTER_KEYWORDS). 'exclude_keywords' se aplica siempre.
 
     Returns:
-        Lista de dicts con: title, link, description, pub_date, pub_date_raw,
-                           image, author, video_id
+        KeywordMatcher, o None si el canal no filtra nada
     """
-    try:
-        with open(feed_file, 'r', encoding='utf-8') as f:
-            content = f.read()
+    include = ()
+    if channel_info.get('filter_keywords'):
+        include = tuple(channel_info.get('include_keywords') or VIDEO_FILTER_KEYWORDS)
+    exclude = tuple(channel_info.get('exclude_keywords') or ())
+    if not include and not exclude:
+        return None
+    return compile_keyword_matcher(include, exclude)
 
-        # Limpiar contenido (igual que parse_feed)
-        xml_start = content.find('<?xml')
-        if xml_start > 0:
-            content = content[xml_start:]
+def title_matches_keywords(title, keywords=None):
+    """Indica si un título contiene alguna de las palabras clave (sin distinguir mayúsculas ni acentos)"""
+    return compile_keyword_matcher(tuple(keywords or VIDEO_FILTER_KEYWORDS)).matches(title)
 
-        root = ET.fromstring(content)
+# Namespaces de YouTube Atom feed
+YOUTUBE_NS = {
+    'atom': 'http://www.w3.org/2005/Atom',
+    'media': 'http://search.yahoo.com/mrss/',
+    'yt': 'http://www.youtube.com/xml/schemas/2015'
+}
 
-        # Namespaces de YouTube Atom feed
-        ns = {
-            'atom': 'http://www.w3.org/2005/Atom',
-            'media': 'http://search.yahoo.com/mrss/',
-            'yt': 'http://www.youtube.com/xml/schemas/2015'
+def iter_youtube_entries(chunks, default_author=''):
+    """Extrae los datos crudos de cada <entry> de un feed Atom de YouTube
+
+    Recorre el XML de forma incremental (ver iter_feed_elements) y devuelve
+    dicts con title, link, published, author, thumbnail, description y
+    video_id, sin limpiar ni filtrar, en el orden del feed.
+    """
+    ns = YOUTUBE_NS
+    for entry in iter_feed_elements(chunks, f"{{{ns['atom']}}}entry"):
+        # Extraer datos
+        title_elem = entry.find('atom:title', ns)
+        link_elem = entry.find('atom:link[@rel="alternate"]', ns)
+        published_elem = entry.find('atom:published', ns)
+        author_elem = entry.find('atom:author/atom:name', ns)
+        thumbnail_elem = entry.find('.//media:thumbnail', ns)
+        desc_elem = entry.find('.//media:description', ns)
+        video_id_elem = entry.find('yt:videoId', ns)
+
+        yield {
+            'title': title_elem.text if title_elem is not None else '',
+            'link': link_elem.get('href') if link_elem is not None else '',
+            'published': published_elem.text if published_elem is not None else '',
+            'author': author_elem.text if author_elem is not None else default_author,
+            'thumbnail': thumbnail_elem.get('url') if thumbnail_elem is not None else None,
+            'description': desc_elem.text if desc_elem is not None else '',
+            'video_id': video_id_elem.text if video_id_elem is not None else ''
         }
 
-        videos = []
-        entries = root.findall('atom:entry', ns)[:limit]
+def read_youtube_entries(chunks, channel_info, limit=15):
+    """Primeras `limit` entradas crudas de un feed de YouTube (ver iter_youtube_entries)"""
+    return list(itertools.islice(iter_youtube_entries(chunks, channel_info['name']), limit))
 
-        for entry in entries:
-            # Extraer datos
-            title_elem = entry.find('atom:title', ns)
-            title = title_elem.text if title_elem is not None else ''
+def parse_youtube_feed(feed_file, channel_info, limit=15, entries=None):
+    """Parsea un feed Atom de YouTube y genera sus videos, del más nuevo al más viejo
 
-            link_elem = entry.find('atom:link[@rel="alternate"]', ns)
-            link = link_elem.get('href') if link_elem is not None else ''
+    Es un generador: el filtrado por keywords y la limpieza de cada video se
+    hacen recién cuando se pide el siguiente, así quien consume puede
+    dejar de iterar cuando ya no necesita más videos del canal.
+
+    YouTube no garantiza que el feed venga ordenado (vivos y estrenos usan
+    la fecha programada), por eso las entradas se ordenan por fecha antes de
+    procesarlas.
+
+    Args:
+        feed_file: Ruta al archivo XML del feed
+        channel_info: Dict con 'filter_keywords', 'name' del canal (y
+                      opcionalmente 'include_keywords'/'exclude_keywords')
+        limit: Videos a buscar antes de filtrar
+        entries: Entradas ya leídas con read_youtube_entries() (ej: durante
+                 la descarga); si no se pasan se lee feed_file
+
+    Yields:
+        Dicts con: title, link, description, pub_date, pub_date_raw,
+                   image, author, video_id
+    """
+    if entries is None:
+        try:
+            entries = read_youtube_entries(read_feed_chunks(feed_file), channel_info, limit)
+        except FileNotFoundError:
+            print(f"  ⚠ Feed no encontrado: {feed_file}")
+            return
+        except ET.ParseError as e:
+            print(f"  ⚠ Error parseando XML: {e}")
+            return
+        except Exception as e:
+            print(f"  ⚠ Error: {e}")
+            return
+
+    # Más nuevos primero (el orden es estable para fechas iguales)
+    entries = sorted(entries, key=lambda entry: entry['published'], reverse=True)
+
+    matcher = channel_keyword_matcher(channel_info)
+
+    for entry in entries:
+        title = entry['title']
+        video_id = entry['video_id']
+
+        # Fallback para thumbnail
+        thumbnail_url = entry['thumbnail']
+        if not thumbnail_url and video_id:
+            thumbnail_url = f'https://i.ytimg.com/vi/{video_id}/hqdefault.jpg'
+
+        # Filtrar por keywords si es necesario
+        if matcher and not matcher.matches(title):
+            continue
 
-            published_elem = entry.find('atom:published', ns)
-            published = published_elem.text if published_elem is not None else ''
+        # Limpiar descripción
+        clean_desc = clean_html(entry['description'])
 
-            author_elem = entry.find('atom:author/atom:name', ns)
-            author = author_elem.text if author_elem is not None else channel_info['name']
+        yield {
+            'title': title,
+            'link': entry['link'],
+            'description': clean_desc[:MAX_DESCRIPCION] + '...' if len(clean_desc) > MAX_DESCRIPCION else clean_desc,
+            'pub_date': format_youtube_date(entry['published']),
+            'pub_date_raw': entry['published'],  # Para ordenamiento
+            'image': thumbnail_url,
+            'author': entry['author'],
+            'video_id': video_id
+        }
 
-            thumbnail_elem = entry.find('.//media:thumbnail', ns)
-            thumbnail_url = thumbnail_elem.get('url') if thumbnail_elem is not None else None
+def tag_channel_videos(handle, videos):
+    """Generador de tuplas (handle, video) para los videos de un canal"""
+    for video in videos:
+        yield handle, video
 
-            desc_elem = entry.find('.//media:description', ns)
-            description = desc_elem.text if desc_elem is not None else ''
+def record_videos(videos, consumed):
+    """Generador que agrega a `consumed` cada video a medida que se pide
 
-            video_id_elem = entry.find('yt:videoId', ns)
-            video_id = video_id_elem.text if video_id_elem is not None else ''
+    Al cerrarlo (ej: desde merge_latest_videos) cierra también `videos`.
+    """
+    try:
+        for video in videos:
+            consumed.append(video)
+            yield video
+    finally:
+        if hasattr(videos, 'close'):
+            videos.close()
 
-            # Fallback para thumbnail
-            if not thumbnail_url and video_id:
-                thumbnail_url = f'https://i.ytimg.com/vi/{video_id}/hqdefault.jpg'
+def merge_latest_videos(channel_videos, limit):
+    """Combina los videos de varios canales y devuelve los `limit` más nuevos
 
-            # Filtrar por keywords si es necesario
-            if channel_info['filter_keywords']:
-                title_lower = title.lower()
-                if not any(keyword.lower() in title_lower for keyword in VIDEO_FILTER_KEYWORDS):
-                    continue
+    Hace un k-way merge con heap sobre los generadores de cada canal (ya
+    ordenados del más nuevo al más viejo): de cada canal solo se procesan
+    los videos necesarios y se deja de iterar apenas se conocen los
+    `limit` más nuevos.
 
-            # Limpiar descripción
-            clean_desc = clean_html(description)
+    Args:
+        channel_videos: Dict {handle: iterable de videos ordenados}
+        limit: Cantidad de videos a devolver
 
-            videos.append({
-                'title': title,
-                'link': link,
-                'description': clean_desc[:MAX_DESCRIPCION] + '...' if len(clean_desc) > MAX_DESCRIPCION else clean_desc,
-                'pub_date': format_youtube_date(published),
-                'pub_date_raw': published,  # Para ordenamiento
-                'image': thumbnail_url,
-                'author': author,
-                'video_id': video_id
-            })
+    Returns:
+        Lista de tuplas (handle, video) del más nuevo al más viejo
+    """
+    streams = [tag_channel_videos(handle, videos) for handle, videos in channel_videos.items()]
+    merged = heapq.merge(*streams, key=lambda pair: pair[1]['pub_date_raw'], reverse=True)
+    latest = list(itertools.islice(merged, limit))
 
-        return videos
+    # Cerrar los canales que quedaron a medio recorrer
+    for stream in streams:
+        stream.close()
+    for videos in channel_videos.values():
+        if hasattr(videos, 'close'):
+            videos.close()
 
-    except FileNotFoundError:
-        print(f"  ⚠ Feed no encontrado: {feed_file}")
-        return []
-    except ET.ParseError as e:
-        print(f"  ⚠ Error parseando XML: {e}")
-        return []
-    except Exception as e:
-        print(f"  ⚠ Error: {e}")
-        return []
+    return latest
 
 def extract_first_image(html_content):
     """Extrae la URL de la primera imagen del contenido HTML"""
@@ -271,155 +1085,1332 @@ def create_slug(text):
 
     return text
 
-def generate_video_page(video, slug):
-    """Genera una página HTML individual para un video de YouTube
+def content_hash(content):
+    """Calcula el hash SHA-256 (hex) de un texto o de bytes"""
+    if isinstance(content, str):
+        content = content.encode('utf-8')
+    return hashlib.sha256(content).hexdigest()
+
+def write_if_changed(path, content):
+    """Escribe un archivo solo si su contenido cambió
+
+    Compara el hash del contenido nuevo con el del archivo en disco. Si son
+    iguales no se toca el archivo (ni su fecha de modificación).
+
+    Returns:
+        True si el archivo se escribió, False si ya estaba actualizado
+    """
+    path = Path(path)
+    data = content.encode('utf-8') if isinstance(content, str) else content
+
+    if path.exists() and content_hash(path.read_bytes()) == content_hash(data):
+        return False
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    return True
+
+# Minificación de HTML (MINIFICAR_HTML)
+# Elementos que arrancan o terminan una línea: los espacios pegados a ellos no se ven
+MINIFY_BLOCK_TAGS = {
+    'html', 'head', 'body', 'title', 'meta', 'link', 'base', 'div', 'p', 'br', 'hr',
+    'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'ul', 'ol', 'li', 'dl', 'dt', 'dd',
+    'table', 'thead', 'tbody', 'tfoot', 'tr', 'td', 'th', 'section', 'article',
+    'aside', 'header', 'footer', 'nav', 'main', 'figure', 'figcaption', 'form',
+    'fieldset', 'legend', 'blockquote', 'address'
+}
+# Elementos cuyo contenido se copia sin tocar
+MINIFY_PRESERVE_TAGS = {'pre', 'textarea', 'script', 'style'}
+# Clases con white-space: pre-wrap en generate_stylesheet()
+MINIFY_PRESERVE_CLASSES = {'video-description'}
+HTML_VOID_TAGS = {
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta',
+    'param', 'source', 'track', 'wbr'
+}
+# Espacios de HTML (no incluye &nbsp; ni otros espacios Unicode, que sí se ven)
+HTML_WHITESPACE = re.compile(r'[ \t\n\r\f]+')
+
+class HTMLTokenizer(html.parser.HTMLParser):
+    """Parte un documento HTML en tokens (tipo, texto)
+
+    Tipos: 'block' / 'inline' (tags), 'text' (texto que se puede
+    normalizar) y 'raw' (texto, comentarios y declaraciones que hay que
+    conservar tal cual, como el contenido de <script> o de un pre-wrap).
+    Los comentarios fuera de zonas protegidas se descartan.
+
+    El texto se decodifica y se vuelve a escapar (un "Q&A" suelto queda
+    "Q&amp;A"), salvo dentro de <script> y <style>, que se copia tal cual.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.tokens = []
+        self._stack = []  # (tag, protegido)
+
+    def _preserving(self):
+        return bool(self._stack) and self._stack[-1][1]
+
+    def _tag_kind(self, tag):
+        return 'block' if tag in MINIFY_BLOCK_TAGS else 'inline'
+
+    def _start(self, tag, attrs, closed):
+        self.tokens.append((self._tag_kind(tag), self.get_starttag_text()))
+        if closed or tag in HTML_VOID_TAGS:
+            return
+        classes = set((dict(attrs).get('class') or '').split())
+        preserve = self._preserving() or tag in MINIFY_PRESERVE_TAGS or bool(classes & MINIFY_PRESERVE_CLASSES)
+        self._stack.append((tag, preserve))
+
+    def handle_starttag(self, tag, attrs):
+        self._start(tag, attrs, closed=False)
+
+    def handle_startendtag(self, tag, attrs):
+        self._start(tag, attrs, closed=True)
+
+    def handle_endtag(self, tag):
+        self.tokens.append((self._tag_kind(tag), f'</{tag}>'))
+        for depth in range(len(self._stack) - 1, -1, -1):
+            if self._stack[depth][0] == tag:
+                del self._stack[depth:]
+                break
+
+    def handle_data(self, data):
+        # El contenido de <script> y <style> llega sin decodificar
+        if not self.cdata_elem:
+            data = html.escape(data, quote=False)
+        self.tokens.append(('raw' if self._preserving() else 'text', data))
+
+    def handle_comment(self, data):
+        # Se conservan los comentarios condicionales de IE
+        if self._preserving() or data.startswith('[if') or data.startswith('<![endif'):
+            self.tokens.append(('raw', f'<!--{data}-->'))
+
+    def handle_decl(self, decl):
+        self.tokens.append(('block', f'<!{decl}>'))
+
+    def unknown_decl(self, data):
+        self.tokens.append(('raw', f'<![{data}]>'))
+
+    def handle_pi(self, data):
+        self.tokens.append(('raw', f'<?{data}>'))
+
+def collapse_html_whitespace(tokens):
+    """Normaliza los espacios de una lista de tokens de HTMLTokenizer
+
+    Como hace el navegador con white-space: normal: cada tramo de espacios
+    queda en uno solo y se sacan los que están pegados al comienzo o al
+    final de un elemento de bloque. Los tokens 'raw' no se tocan.
+
+    Returns:
+        Lista de strings
+    """
+    merged = []
+    for kind, text in tokens:
+        if kind == 'text' and merged and merged[-1][0] == 'text':
+            merged[-1] = ('text', merged[-1][1] + text)
+        else:
+            merged.append((kind, text))
+
+    parts = []
+    for i, (kind, text) in enumerate(merged):
+        if kind == 'text':
+            text = HTML_WHITESPACE.sub(' ', text)
+            if i == 0 or merged[i - 1][0] == 'block':
+                text = text.lstrip(' ')
+            if i == len(merged) - 1 or merged[i + 1][0] == 'block':
+                text = text.rstrip(' ')
+            if not text:
+                continue
+        parts.append(text)
+    return parts
+
+def minify_html(content):
+    """Saca comentarios, indentación y espacios que no cambian cómo se ve la página
+
+    No toca el contenido de <pre>, <textarea>, <script>, <style> ni de los
+    elementos con clases pre-wrap (MINIFY_PRESERVE_CLASSES), ni los tags.
+    """
+    tokenizer = HTMLTokenizer()
+    tokenizer.feed(content)
+    tokenizer.close()
+    return ''.join(collapse_html_whitespace(tokenizer.tokens))
+
+# Elementos que ocupan lugar en la línea aunque no tengan texto
+HTML_REPLACED_TAGS = {'img', 'input', 'iframe', 'embed', 'object', 'video', 'audio', 'canvas', 'svg', 'select'}
+
+class DOMTreeBuilder(html.parser.HTMLParser):
+    """Arma el árbol de un documento: nodos [tag, atributos ordenados, hijos]
+
+    Los hijos son nodos o strings (texto decodificado); los comentarios se
+    descartan.
+    """
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.root = ['#document', (), []]
+        self._stack = [self.root]
+
+    def handle_starttag(self, tag, attrs):
+        node = [tag, tuple(sorted((name, value or '') for name, value in attrs)), []]
+        self._stack[-1][2].append(node)
+        if tag not in HTML_VOID_TAGS:
+            self._stack.append(node)
+
+    def handle_startendtag(self, tag, attrs):
+        self._stack[-1][2].append([tag, tuple(sorted((name, value or '') for name, value in attrs)), []])
+
+    def handle_endtag(self, tag):
+        for depth in range(len(self._stack) - 1, 0, -1):
+            if self._stack[depth][0] == tag:
+                del self._stack[depth:]
+                break
+
+    def handle_data(self, data):
+        self._stack[-1][2].append(data)
+
+    def handle_decl(self, decl):
+        self._stack[-1][2].append(['!' + decl.lower(), (), []])
+
+class WhitespaceCollapser:
+    """Procesa los espacios de un árbol de DOMTreeBuilder como CSS white-space: normal
+
+    Recorre el texto en orden: cada tramo de espacios queda en uno, un
+    espacio que sigue a otro en la misma línea (aunque estén en elementos
+    distintos) desaparece, y se borran los espacios al principio y al
+    final de cada línea (bordes de los elementos de bloque y <br>). El
+    texto de <pre>, <textarea>, <script>, <style> y de las clases pre-wrap
+    queda igual; <script> y <style> no cortan ni ocupan la línea.
+    """
+
+    def __init__(self):
+        self.after_space = True  # Comienzo de línea
+        self.last_text = None    # (lista de hijos, índice) del último texto de la línea
+
+    def end_line(self):
+        if self.last_text is not None:
+            children, index = self.last_text
+            children[index] = children[index].rstrip(' ')
+        self.last_text = None
+        self.after_space = True
+
+    def walk(self, node):
+        children = node[2]
+        for index, child in enumerate(children):
+            if isinstance(child, str):
+                text = HTML_WHITESPACE.sub(' ', child)
+                if self.after_space:
+                    text = text.lstrip(' ')
+                children[index] = text
+                if text:
+                    self.after_space = text.endswith(' ')
+                    self.last_text = (children, index)
+                continue
+
+            tag, attrs = child[0], child[1]
+            classes = set(dict(attrs).get('class', '').split())
+            if tag in ('script', 'style'):
+                continue
+            block = tag in MINIFY_BLOCK_TAGS or tag.startswith('!')
+            if block:
+                self.end_line()
+            if tag in MINIFY_PRESERVE_TAGS or classes & MINIFY_PRESERVE_CLASSES:
+                self.after_space = False
+                self.last_text = None
+            elif tag in HTML_REPLACED_TAGS:
+                self.walk(child)
+                self.after_space = False
+                self.last_text = None
+            else:
+                self.walk(child)
+            if block:
+                self.end_line()
+
+def _dom_signature_node(node):
+    parts = []
+    for child in node[2]:
+        if isinstance(child, str):
+            if not child:
+                continue
+            if parts and isinstance(parts[-1], str):
+                parts[-1] += child
+            else:
+                parts.append(child)
+        else:
+            parts.append(_dom_signature_node(child))
+    return (node[0], node[1], tuple(parts))
+
+def html_dom_signature(content):
+    """Representación del DOM tal como se ve, para comparar dos documentos
+
+    Es independiente del minificador: arma el árbol completo y procesa los
+    espacios con las reglas de CSS (WhitespaceCollapser). Tags y atributos
+    decodificados, sin comentarios y con los textos vacíos descartados.
+    """
+    builder = DOMTreeBuilder()
+    builder.feed(content)
+    builder.close()
+    collapser = WhitespaceCollapser()
+    collapser.walk(builder.root)
+    collapser.end_line()
+    return _dom_signature_node(builder.root)
+
+class MinifyReport:
+    """Bytes antes y después de minificar las páginas de un build"""
+
+    def __init__(self):
+        self.pages = 0
+        self.original = 0
+        self.minified = 0
+        self.rejected = 0
+
+    def merge(self, other):
+        self.pages += other.pages
+        self.original += other.original
+        self.minified += other.minified
+        self.rejected += other.rejected
+
+MINIFY_REPORT = MinifyReport()
+
+def minify_page(content, report=None):
+    """Minifica una página y verifica que el DOM sea el mismo
+
+    Si la versión minificada no fuera equivalente (algún HTML que el
+    minificador no contempla) se devuelve la página original.
+    """
+    report = report or MINIFY_REPORT
+    minified = minify_html(content)
+    if html_dom_signature(minified) != html_dom_signature(content):
+        report.rejected += 1
+        return content
+    report.pages += 1
+    report.original += len(content.encode('utf-8'))
+    report.minified += len(minified.encode('utf-8'))
+    return minified
+
+def write_html(path, content, report=None):
+    """Escribe una página generada (minificada si MINIFICAR_HTML)
+
+    Returns:
+        True si el archivo se escribió, False si ya estaba actualizado
+    """
+    if MINIFICAR_HTML:
+        content = minify_page(content, report)
+    return write_if_changed(path, content)
+
+def config_values():
+    """Valores actuales de todas las opciones de config.py"""
+    return {name: globals()[name] for name in dir(config) if name.isupper() and name in globals()}
+
+def build_fingerprint(feeds_items):
+    """Calcula la huella de todo lo que determina el sitio generado
+
+    Incluye los items parseados de cada feed (identificados por GUID o
+    video_id, en orden), los valores de config.py y el código de build.py
+    (plantillas incluidas).
 
     Args:
-        video: Dict con información del video (title, video_id, author, pub_date, description)
-        slug: Slug URL-friendly para la página
+        feeds_items: Dict {nombre del feed: lista de items parseados}
+    """
+    data = {
+        'feeds': {
+            name: [
+                [item.get('guid') or item.get('video_id') or item.get('link'),
+                 content_hash(json.dumps(item, sort_keys=True, ensure_ascii=False))]
+                for item in items
+            ]
+            for name, items in feeds_items.items()
+        },
+        'config': config_values(),
+        'build': content_hash(Path(__file__).read_bytes())
+    }
+    return content_hash(json.dumps(data, sort_keys=True, ensure_ascii=False, default=repr))
+
+def load_build_fingerprint():
+    """Huella guardada por el último build completo (None si no hay)"""
+    try:
+        return json.loads(BUILD_FINGERPRINT_FILE.read_text(encoding='utf-8')).get('fingerprint')
+    except (OSError, ValueError):
+        return None
+
+def save_build_fingerprint(fingerprint):
+    BUILD_FINGERPRINT_FILE.parent.mkdir(parents=True, exist_ok=True)
+    BUILD_FINGERPRINT_FILE.write_text(json.dumps({
+        'fingerprint': fingerprint,
+        'timestamp': datetime.now().isoformat(timespec='seconds')
+    }, indent=2), encoding='utf-8')
+
+# Código que escribe páginas HTML (y las minifica si MINIFICAR_HTML)
+HTML_WRITER_CODE = (
+    'write_html', 'write_if_changed', 'minify_page', 'minify_html', 'collapse_html_whitespace',
+    'HTMLTokenizer', 'html_dom_signature', 'DOMTreeBuilder', 'WhitespaceCollapser', '_dom_signature_node'
+)
+HTML_WRITER_CONSTANTS = (
+    'HTML_WHITESPACE', 'HTML_VOID_TAGS', 'HTML_REPLACED_TAGS', 'MINIFY_BLOCK_TAGS',
+    'MINIFY_PRESERVE_TAGS', 'MINIFY_PRESERVE_CLASSES'
+)
+
+# De qué depende cada tipo de salida además de sus datos. Se declara a mano:
+# - code: funciones y clases de build.py que la generan (se hashea su código)
+# - constants: constantes de build.py que usan
+# - config: opciones de config.py que usan (las de las plantillas se suman solas)
+# - templates: plantillas de TEMPLATE_SOURCES
+# Si una de esas funciones empieza a usar otra función, constante u opción,
+# hay que agregarla acá para que los cambios regeneren la salida.
+OUTPUT_GENERATORS = {
+    'index': {
+        'code': ('generate_html', 'card_image_html', 'video_card_sizes', 'youtube_thumbnail_srcset',
+                 'create_slug', 'site_templates', '_compile_templates', 'Template') + HTML_WRITER_CODE,
+        'constants': ('VIDEO_IMAGE_PLACEHOLDER', 'PHOTO_IMAGE_PLACEHOLDER', 'YOUTUBE_THUMBNAILS',
+                      'YOUTUBE_THUMBNAIL_DEFAULT', 'BOOTSTRAP_BREAKPOINT_MD', 'BOOTSTRAP_CONTAINERS',
+                      'BOOTSTRAP_GUTTER') + HTML_WRITER_CONSTANTS,
+        'config': ('MOSTRAR_VIDEOS', 'MOSTRAR_NOTICIAS', 'MOSTRAR_FOTOS', 'MOSTRAR_AGENDA',
+                   'COLUMNAS_VIDEOS', 'ALTURA_IMAGEN_VIDEO', 'MINIFICAR_HTML'),
+        'templates': (
+            'index_header', 'videos_section', 'video_card', 'promo_card', 'section_end',
+            'news_section', 'news_card_image', 'news_card_text', 'photos_section', 'photo_card',
+            'agenda_section', 'agenda_card', 'index_footer', 'card_image', 'video_card_image',
+            'card_picture'
+        ),
+    },
+    'video_page': {
+        'code': ('generate_video_page', 'video_embed_html', 'video_preconnect_html', 'youtube_embed_host',
+                 'site_templates', '_compile_templates', 'Template') + HTML_WRITER_CODE,
+        'constants': ('YOUTUBE_FACADE_SCRIPT', 'YOUTUBE_IFRAME_ALLOW', 'VIDEO_PAGE_ROOT') + HTML_WRITER_CONSTANTS,
+        'config': ('YOUTUBE_FACADE', 'YOUTUBE_NOCOOKIE', 'YOUTUBE_PRECONNECT', 'MINIFICAR_HTML'),
+        'templates': ('video_page',),
+    },
+    'sitemap': {
+        'code': ('generate_sitemap', 'sitemap_lastmod', 'SitemapWriter', 'write_if_changed'),
+        'constants': ('SITEMAP_MAX_BYTES',),
+        'config': ('SITEMAP_URLS_POR_ARCHIVO',),
+        'templates': (),
+    },
+}
+
+@functools.lru_cache(maxsize=None)
+def output_dependencies(kind):
+    """Opciones de config.py y código del que depende un tipo de salida
+
+    Las opciones son las declaradas en OUTPUT_GENERATORS más los campos en
+    MAYÚSCULAS de sus plantillas. Así una página de video depende de
+    YOUTUBE_FACADE pero no de LIMITE_NOTICIAS (los colores le llegan por el
+    nombre de la hoja de estilos).
+
+    Args:
+        kind: Clave de OUTPUT_GENERATORS ('index', 'video_page', 'sitemap')
 
     Returns:
-        String con el HTML completo de la página
+        Tupla (opciones de config.py ordenadas, hash del código, constantes y plantillas)
+    """
+    generator = OUTPUT_GENERATORS[kind]
+    used = set(generator['config'])
+    code = hashlib.sha256()
+    for name in generator['code']:
+        code.update(inspect.getsource(globals()[name]).encode('utf-8'))
+    for name in generator['constants']:
+        value = globals()[name]
+        if isinstance(value, (set, frozenset)):
+            # El orden de un set cambia entre procesos
+            value = sorted(value)
+        code.update(f'{name}={value!r}'.encode('utf-8'))
+    for name in generator['templates']:
+        code.update(TEMPLATE_SOURCES[name].encode('utf-8'))
+        used.update(
+            field for _, field, _, _ in string.Formatter().parse(TEMPLATE_SOURCES[name])
+            if field and field.isupper()
+        )
+    return tuple(sorted(used)), code.hexdigest()
+
+def output_hash(kind, inputs):
+    """Hash de todo lo que determina una salida: datos, config que usa y código"""
+    keys, code = output_dependencies(kind)
+    return content_hash(json.dumps({
+        'inputs': inputs,
+        'config': {key: globals()[key] for key in keys},
+        'code': code
+    }, sort_keys=True, ensure_ascii=False, default=repr))
+
+def video_page_hash(video, slug, stylesheet_href):
+    """Hash de dependencias de la página de un video
+
+    Incluye los campos de la plantilla y los que generate_video_page() y
+    video_embed_html() leen por su cuenta (VIDEO_PAGE_FIELDS).
+    """
+    fields = sorted(set(site_templates()['video_page'].fields) | set(VIDEO_PAGE_FIELDS))
+    return output_hash('video_page', {
+        'video': {field: video.get(field) for field in fields},
+        'slug': slug,
+        'stylesheet_href': stylesheet_href
+    })
+
+class OutputManifest:
+    """Hash de dependencias de cada archivo generado
+
+    Se guarda en OUTPUT_MANIFEST_FILE. Una salida está al día si su hash no
+    cambió y el archivo sigue existiendo; en ese caso ni se renderiza.
+    """
+
+    def __init__(self, path=None):
+        self.path = Path(path or OUTPUT_MANIFEST_FILE)
+        try:
+            self.hashes = json.loads(self.path.read_text(encoding='utf-8'))
+        except (OSError, ValueError):
+            self.hashes = {}
+
+    def is_current(self, output, digest):
+        return self.hashes.get(str(output)) == digest and Path(output).exists()
+
+    def update(self, output, digest):
+        self.hashes[str(output)] = digest
+
+    def recorded(self, output):
+        return self.hashes.get(str(output))
+
+    def forget(self, output):
+        self.hashes.pop(str(output), None)
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text(json.dumps(self.hashes, indent=0, sort_keys=True), encoding='utf-8')
+
+def video_content_hash(video):
+    """Hash de los datos de un video que se muestran en su página"""
+    fields = ('title', 'description', 'author', 'link', 'image', 'pub_date_raw')
+    return content_hash(json.dumps([video.get(field) for field in fields], ensure_ascii=False))
+
+def open_video_catalog(catalog_file=None, videos_dir=None):
+    """Abre (o crea) el catálogo SQLite de videos
+
+    El catálogo guarda todos los videos que devolvió alguna vez
+    parse_youtube_feed() (tabla `videos`, clave video_id) y las páginas
+    generadas para ellos (tabla `video_pages`, clave slug). Si el catálogo
+    está vacío se importan las páginas que ya existen en docs/videos/.
+
+    Args:
+        catalog_file: Ruta del archivo SQLite (default: VIDEO_CATALOG_FILE)
+        videos_dir: Directorio con las páginas de videos ya generadas
+    """
+    catalog_file = Path(catalog_file or VIDEO_CATALOG_FILE)
+    catalog_file.parent.mkdir(parents=True, exist_ok=True)
+
+    conn = sqlite3.connect(catalog_file)
+    conn.row_factory = sqlite3.Row
+    conn.executescript('''
+        CREATE TABLE IF NOT EXISTS videos (
+            video_id TEXT PRIMARY KEY,
+            title TEXT NOT NULL,
+            author TEXT,
+            channel TEXT,
+            published TEXT,
+            slug TEXT,
+            link TEXT,
+            description TEXT,
+            image TEXT,
+            content_hash TEXT,
+            first_seen TEXT,
+            modified TEXT
+        );
+        CREATE INDEX IF NOT EXISTS idx_videos_published ON videos (published);
+        CREATE INDEX IF NOT EXISTS idx_videos_channel ON videos (channel, published);
+
+        CREATE TABLE IF NOT EXISTS video_pages (
+            slug TEXT PRIMARY KEY,
+            video_id TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_video_pages_video ON video_pages (video_id);
+    ''')
+    # Catálogos creados antes de la columna `modified`
+    columns = {row['name'] for row in conn.execute('PRAGMA table_info(videos)')}
+    if 'modified' not in columns:
+        conn.execute('ALTER TABLE videos ADD COLUMN modified TEXT')
+
+    if videos_dir is not None and conn.execute('SELECT COUNT(*) FROM videos').fetchone()[0] == 0:
+        imported = import_video_pages(conn, videos_dir)
+        if imported:
+            print(f"  ✓ Catálogo inicializado con {imported} páginas existentes")
+
+    return conn
+
+def save_catalog_videos(conn, videos, channel=None):
+    """Guarda (o actualiza) videos en el catálogo
+
+    `modified` queda vacío hasta que los datos del video cambian respecto
+    de un hash anterior del feed (ver sitemap_lastmod()).
+
+    Args:
+        conn: Conexión al catálogo
+        videos: Lista de dicts como los que devuelve parse_youtube_feed()
+        channel: Handle del canal (clave de YOUTUBE_CHANNELS)
+    """
+    now = datetime.now().isoformat(timespec='seconds')
+    rows = [
+        {
+            'video_id': video['video_id'],
+            'title': video['title'],
+            'author': video['author'],
+            'channel': video.get('channel', channel),
+            'published': video['pub_date_raw'],
+            'slug': create_slug(video['title']),
+            'link': video['link'],
+            'description': video['description'],
+            'image': video['image'],
+            'content_hash': video_content_hash(video),
+            'now': now
+        }
+        for video in videos if video.get('video_id')
+    ]
+    with conn:
+        conn.executemany('''
+            INSERT INTO videos (video_id, title, author, channel, published, slug, link,
+                                description, image, content_hash, first_seen)
+            VALUES (:video_id, :title, :author, :channel, :published, :slug, :link,
+                    :description, :image, :content_hash, :now)
+            ON CONFLICT (video_id) DO UPDATE SET
+                modified = CASE WHEN content_hash IS NULL OR content_hash IS excluded.content_hash
+                                THEN modified ELSE excluded.first_seen END,
+                title = excluded.title,
+                author = excluded.author,
+                channel = COALESCE(excluded.channel, channel),
+                published = excluded.published,
+                slug = excluded.slug,
+                link = excluded.link,
+                description = excluded.description,
+                image = excluded.image,
+                content_hash = excluded.content_hash
+        ''', rows)
+
+def save_catalog_pages(conn, pages):
+    """Registra las páginas generadas
+
+    Args:
+        conn: Conexión al catálogo
+        pages: Iterable de tuplas (slug, video_id)
+    """
+    with conn:
+        conn.executemany(
+            'INSERT OR REPLACE INTO video_pages (slug, video_id) VALUES (?, ?)',
+            list(pages)
+        )
+
+def catalog_pages(conn):
+    """Páginas de videos generadas con sus fechas, de la más vieja a la más nueva"""
+    return [dict(row) for row in conn.execute('''
+        SELECT p.slug, v.published, v.first_seen, v.modified
+        FROM video_pages p LEFT JOIN videos v ON v.video_id = p.video_id
+        ORDER BY v.published, p.slug
+    ''')]
+
+def video_from_catalog(row):
+    """Arma desde una fila del catálogo el dict de video que usa generate_video_page()"""
+    return {
+        'title': row['title'],
+        'link': row['link'] or '',
+        'description': row['description'] or '',
+        'pub_date': format_youtube_date(row['published']),
+        'pub_date_raw': row['published'] or '',
+        'image': row['image'],
+        'author': row['author'] or '',
+        'video_id': row['video_id']
+    }
+
+def catalog_videos(conn, channel=None, with_page=False, before=None, limit=None):
+    """Videos del catálogo del más nuevo al más viejo, de a una página
+
+    Para recorrer el archivo completo (o el de un canal) sin cargarlo entero
+    se pide la página siguiente pasando en `before` la clave del último
+    video de la anterior (ver catalog_key). Usa los índices por fecha y por
+    canal, así cada página cuesta lo mismo aunque haya miles de videos.
+
+    Args:
+        conn: Conexión al catálogo
+        channel: Si se indica, solo videos de ese canal (handle)
+        with_page: Si es True, una fila por página generada (con `page_slug`)
+        before: Clave (published, video_id o page_slug) del último video ya leído
+        limit: Cantidad máxima de filas (default: CATALOG_PAGE_SIZE)
+
+    Returns:
+        Lista de dicts con las columnas de `videos` (y `page_slug`)
+    """
+    key = 'p.slug' if with_page else 'v.video_id'
+    query = 'SELECT v.*' + (', p.slug AS page_slug' if with_page else '') + ' FROM videos v'
+    if with_page:
+        # CROSS JOIN: SQLite recorre `videos` por el índice de fecha
+        query += ' CROSS JOIN video_pages p ON p.video_id = v.video_id'
+    conditions = []
+    params = []
+    if channel is not None:
+        conditions.append('v.channel = ?')
+        params.append(channel)
+    if before is not None:
+        conditions.append(f'(v.published < ? OR (v.published = ? AND {key} < ?))')
+        params.extend([before[0], before[0], before[1]])
+    if conditions:
+        query += ' WHERE ' + ' AND '.join(conditions)
+    query += f' ORDER BY v.published DESC, {key} DESC LIMIT ?'
+    params.append(limit or CATALOG_PAGE_SIZE)
+    return [dict(row) for row in conn.execute(query, params)]
+
+def catalog_key(row):
+    """Clave de paginación de una fila de catalog_videos()"""
+    return row['published'] or '', row.get('page_slug') or row['video_id']
+
+def iter_catalog_videos(conn, channel=None, with_page=False):
+    """Recorre todo el catálogo (o un canal) de a CATALOG_PAGE_SIZE videos"""
+    before = None
+    while True:
+        rows = catalog_videos(conn, channel=channel, with_page=with_page, before=before)
+        yield from rows
+        if len(rows) < CATALOG_PAGE_SIZE:
+            return
+        before = catalog_key(rows[-1])
+
+def catalog_page_videos(conn, exclude=(), channel=None):
+    """Páginas de videos del catálogo con los datos para regenerarlas
+
+    Args:
+        conn: Conexión al catálogo
+        exclude: Slugs a omitir (ej: las páginas ya generadas en este build)
+        channel: Si se indica, solo las páginas de videos de ese canal
+
+    Returns:
+        Lista de tuplas (slug, video) de la más nueva a la más vieja
+    """
+    exclude = set(exclude)
+    return [
+        (row['page_slug'], video_from_catalog(row))
+        for row in iter_catalog_videos(conn, channel=channel, with_page=True)
+        if row['page_slug'] not in exclude
+    ]
+
+def import_video_pages(conn, videos_dir):
+    """Importa al catálogo las páginas de videos ya generadas en disco
+
+    Se usa una sola vez, cuando el catálogo está vacío, para no perder los
+    videos históricos. Los datos se leen del HTML de cada página.
+
+    Returns:
+        Cantidad de páginas importadas
+    """
+    videos_dir = Path(videos_dir)
+    if not videos_dir.exists():
+        return 0
+
+    videos = []
+    pages = []
+    for video_dir in sorted(videos_dir.iterdir()):
+        page_file = video_dir / 'index.html'
+        if not page_file.is_file():
+            continue
+
+        page = page_file.read_text(encoding='utf-8')
+        video_id = re.search(r'youtube(?:-nocookie)?\.com/embed/([\w-]+)', page)
+        if not video_id:
+            continue
+
+        def field(pattern, default=''):
+            match = re.search(pattern, page, re.DOTALL)
+            return match.group(1) if match else default
+
+        pub_date = field(r'<span>📅 (\d{2}/\d{2}/\d{4})</span>')
+        try:
+            published = datetime.strptime(pub_date, '%d/%m/%Y').strftime('%Y-%m-%dT00:00:00+00:00')
+        except ValueError:
+            published = ''
+
+        video = {
+            'video_id': video_id.group(1),
+            'title': field(r'<h1 class="video-title">(.*?)</h1>', video_dir.name),
+            'author': field(r'<span>📺 <strong>(.*?)</strong></span>'),
+            'pub_date_raw': published,
+            'link': field(r'<a href="([^"]*)" class="btn-instituto btn-secondary"'),
+            'description': field(r'<div class="video-description">(.*?)</div>'),
+            'image': f'https://i.ytimg.com/vi/{video_id.group(1)}/hqdefault.jpg'
+        }
+        videos.append(video)
+        pages.append((video_dir.name, video['video_id']))
+
+    # Un video puede tener más de una página: se guarda una sola vez
+    save_catalog_videos(conn, list({video['video_id']: video for video in videos}.values()))
+    # El slug del catálogo es el de la página en disco, no el recalculado, y
+    # el hash de datos leídos del HTML no se puede comparar con el del feed
+    with conn:
+        conn.executemany('UPDATE videos SET slug = ?, content_hash = NULL WHERE video_id = ?', pages)
+    save_catalog_pages(conn, pages)
+    return len(pages)
+
+def generate_stylesheet():
+    """Genera la hoja de estilos compartida por todas las páginas del sitio
+
+    Los estilos de la página principal van bajo `.pagina-inicio` y los de
+    las páginas de videos bajo `.pagina-video` (clase del <body>).
     """
     # Calcular ancho total de rayas
     ancho_total_rayas = ANCHO_RAYA_ROJA + ANCHO_RAYA_BLANCA
 
-    html = f'''<!DOCTYPE html>
+    return f"""/* Generado por build.py a partir de config.py - no editar */
+
+:root {{
+    --instituto-rojo: {COLOR_ROJO};
+    --instituto-blanco: {COLOR_BLANCO};
+}}
+
+body {{
+    font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif;
+    background: linear-gradient(135deg, #f5f5f5 0%, #e8e8e8 100%);
+    min-height: 100vh;
+}}
+
+/* ===== Página principal ===== */
+
+/* Header con rayas verticales */
+.pagina-inicio .header-instituto {{
+    background: repeating-linear-gradient(
+        90deg,
+        var(--instituto-rojo) 0px,
+        var(--instituto-rojo) {ANCHO_RAYA_ROJA}px,
+        var(--instituto-blanco) {ANCHO_RAYA_ROJA}px,
+        var(--instituto-blanco) {ancho_total_rayas}px
+    );
+    padding: 3rem 0;
+    box-shadow: 0 4px 6px rgba(0,0,0,0.1);
+    position: relative;
+    overflow: hidden;
+}}
+
+.pagina-inicio .header-instituto::after {{
+    content: '';
+    position: absolute;
+    bottom: 0;
+    left: 0;
+    right: 0;
+    height: 4px;
+    background: var(--instituto-rojo);
+}}
+
+.pagina-inicio .header-content {{
+    background: rgba(255, 255, 255, 0.95);
+    padding: 2rem;
+    border-radius: 15px;
+    box-shadow: 0 8px 20px rgba(0,0,0,0.15);
+    backdrop-filter: blur(10px);
+}}
+
+.pagina-inicio h1 {{
+    color: var(--instituto-rojo);
+    font-weight: 800;
+    margin: 0;
+    font-size: 2.5rem;
+    text-transform: uppercase;
+    letter-spacing: 2px;
+}}
+
+.pagina-inicio .subtitle {{
+    color: #666;
+    font-size: 1.1rem;
+    margin-top: 0.5rem;
+}}
+
+.pagina-inicio .section-title {{
+    color: var(--instituto-rojo);
+    font-weight: 700;
+    margin: 3rem 0 1.5rem 0;
+    padding-bottom: 0.5rem;
+    border-bottom: 3px solid var(--instituto-rojo);
+    font-size: 1.8rem;
+    text-transform: uppercase;
+    letter-spacing: 1px;
+}}
+
+.pagina-inicio .card {{
+    border: none;
+    border-radius: 15px;
+    overflow: hidden;
+    box-shadow: 0 5px 15px rgba(0,0,0,0.08);
+    transition: all 0.3s ease;
+    height: 100%;
+    background: white;
+}}
+
+.pagina-inicio .card:hover {{
+    transform: translateY(-8px);
+    box-shadow: 0 12px 25px rgba(227, 6, 19, 0.2);
+}}
+
+.pagina-inicio .card-img-top {{
+    height: {ALTURA_IMAGEN_NOTICIA}px;
+    object-fit: cover;
+    background: linear-gradient(135deg, #f0f0f0 0%, #e0e0e0 100%);
+}}
+
+.pagina-inicio .card-body {{
+    padding: 1.5rem;
+}}
+
+.pagina-inicio .card-title {{
+    color: var(--instituto-rojo);
+    font-weight: 700;
+    font-size: 1.2rem;
+    margin-bottom: 1rem;
+    line-height: 1.4;
+}}
+
+.pagina-inicio .card-text {{
+    color: #555;
+    font-size: 0.95rem;
+    line-height: 1.6;
+}}
+
+.pagina-inicio .card-date {{
+    color: #666;
+    font-size: 0.9rem;
+    font-weight: 600;
+    margin-top: 0.8rem;
+    display: block;
+    text-transform: uppercase;
+    letter-spacing: 0.5px;
+}}
+
+.pagina-inicio .card-date-top {{
+    color: var(--instituto-rojo);
+    font-size: 0.85rem;
+    font-weight: 700;
+    display: block;
+    margin-bottom: 1rem;
+    text-transform: uppercase;
+    letter-spacing: 1px;
+    opacity: 0.8;
+}}
+
+.pagina-inicio .btn-instituto {{
+    background: var(--instituto-rojo);
+    color: white;
+    border: none;
+    padding: 0.6rem 1.5rem;
+    border-radius: 25px;
+    font-weight: 600;
+    text-transform: uppercase;
+    font-size: 0.85rem;
+    letter-spacing: 0.5px;
+    transition: all 0.3s ease;
+    text-decoration: none;
+    display: inline-block;
+    margin-top: 1rem;
+}}
+
+.pagina-inicio .btn-instituto:hover {{
+    background: #b30510;
+    transform: scale(1.05);
+    box-shadow: 0 5px 15px rgba(227, 6, 19, 0.3);
+    color: white;
+}}
+
+.pagina-inicio .footer {{
+    background: repeating-linear-gradient(
+        90deg,
+        var(--instituto-rojo) 0px,
+        var(--instituto-rojo) {ANCHO_RAYA_ROJA}px,
+        var(--instituto-blanco) {ANCHO_RAYA_ROJA}px,
+        var(--instituto-blanco) {ancho_total_rayas}px
+    );
+    padding: 2rem 0;
+    margin-top: 4rem;
+    position: relative;
+}}
+
+.pagina-inicio .footer::before {{
+    content: '';
+    position: absolute;
+    top: 0;
+    left: 0;
+    right: 0;
+    height: 3px;
+    background: var(--instituto-rojo);
+}}
+
+.pagina-inicio .footer-content {{
+    background: rgba(255, 255, 255, 0.95);
+    padding: 1.5rem;
+    border-radius: 10px;
+    text-align: center;
+}}
+
+.pagina-inicio .footer-content p {{
+    margin: 0.5rem 0;
+    color: #555;
+}}
+
+.pagina-inicio .footer-content a {{
+    color: var(--instituto-rojo);
+    font-weight: 600;
+    text-decoration: none;
+}}
+
+.pagina-inicio .footer-content a:hover {{
+    text-decoration: underline;
+}}
+
+.pagina-inicio .gallery-card .card-body {{
+    padding: 1rem;
+}}
+
+.pagina-inicio .gallery-card .card-title {{
+    font-size: 1rem;
+}}
+
+/* Estilos para noticias sin imágenes */
+.pagina-inicio .noticia-sin-imagen {{
+    min-height: 200px;
+    background: linear-gradient(135deg, #fafafa 0%, #f5f5f5 100%);
+    border-left: 4px solid var(--instituto-rojo);
+}}
+
+.pagina-inicio .noticia-sin-imagen .card-body {{
+    padding: 1.5rem;
+    display: flex;
+    flex-direction: column;
+}}
+
+.pagina-inicio .noticia-sin-imagen .card-title {{
+    font-size: 1.15rem;
+    margin-bottom: 1rem;
+    line-height: 1.4;
+}}
+
+.pagina-inicio .noticia-sin-imagen .card-text {{
+    font-size: 0.95rem;
+    margin-bottom: 1.5rem;
+    flex-grow: 1;
+    line-height: 1.6;
+}}
+
+/* Estilos para agenda sin imágenes */
+.pagina-inicio .agenda-card {{
+    min-height: 200px;
+    border-left: 4px solid var(--instituto-rojo);
+}}
+
+.pagina-inicio .agenda-card .card-body {{
+    padding: 1.5rem;
+    display: flex;
+    flex-direction: column;
+}}
+
+.pagina-inicio .agenda-card .card-title {{
+    font-size: 1.15rem;
+    margin-bottom: 1rem;
+    line-height: 1.4;
+}}
+
+.pagina-inicio .agenda-card .card-text {{
+    font-size: 0.95rem;
+    margin-bottom: 1rem;
+    flex-grow: 1;
+    line-height: 1.6;
+}}
+
+.pagina-inicio .agenda-card .card-date {{
+    margin-top: auto;
+}}
+
+/* Estilos para videos */
+.pagina-inicio .video-card {{
+    min-height: 340px;
+}}
+
+.pagina-inicio .video-card .card-img-top {{
+    height: {ALTURA_IMAGEN_VIDEO}px;
+    object-fit: cover;
+    background: #000;
+}}
+
+.pagina-inicio .video-card .card-body {{
+    padding: 1.25rem;
+    display: flex;
+    flex-direction: column;
+}}
+
+.pagina-inicio .video-card .card-title {{
+    font-size: 1rem;
+    margin-bottom: 0.5rem;
+    line-height: 1.3;
+    flex-grow: 1;
+}}
+
+.pagina-inicio .video-card .text-muted {{
+    font-size: 0.85rem;
+    margin-bottom: 0.75rem;
+}}
+
+.pagina-inicio .video-card:hover {{
+    transform: translateY(-8px);
+    box-shadow: 0 12px 25px rgba(227, 6, 19, 0.25);
+}}
+
+.pagina-inicio .video-card:hover .card-img-top {{
+    opacity: 0.9;
+}}
+
+.pagina-inicio .video-card a {{
+    cursor: pointer;
+}}
+
+.pagina-inicio .video-card .card-title a:hover {{
+    color: var(--instituto-rojo);
+    opacity: 0.8;
+}}
+
+/* Estilos para bloque promocional BrizuelAMP */
+.pagina-inicio .promo-card {{
+    min-height: 340px;
+    background: linear-gradient(135deg, #fff8f0 0%, #fff5e8 100%);
+    border: 2px solid rgba(227, 6, 19, 0.1);
+}}
+
+.pagina-inicio .promo-card .card-img-top {{
+    height: {ALTURA_IMAGEN_VIDEO}px;
+    object-fit: cover;
+}}
+
+.pagina-inicio .promo-card .card-body {{
+    padding: 1.25rem;
+    display: flex;
+    flex-direction: column;
+}}
+
+.pagina-inicio .promo-card .card-title {{
+    font-size: 1rem;
+    margin-bottom: 0.5rem;
+    line-height: 1.3;
+    flex-grow: 1;
+    color: var(--instituto-rojo);
+}}
+
+.pagina-inicio .promo-card .text-muted {{
+    font-size: 0.85rem;
+    margin-bottom: 0.75rem;
+}}
+
+.pagina-inicio .promo-card:hover {{
+    transform: translateY(-8px);
+    box-shadow: 0 12px 25px rgba(227, 6, 19, 0.25);
+    background: linear-gradient(135deg, #fffaf5 0%, #fff7ed 100%);
+}}
+
+@media (max-width: 768px) {{
+    .pagina-inicio h1 {{
+        font-size: 1.8rem;
+    }}
+
+    .pagina-inicio .section-title {{
+        font-size: 1.4rem;
+    }}
+}}
+
+/* ===== Páginas de videos ===== */
+
+.pagina-video .header-instituto {{
+    background: repeating-linear-gradient(
+        90deg,
+        var(--instituto-rojo) 0px,
+        var(--instituto-rojo) {ANCHO_RAYA_ROJA}px,
+        var(--instituto-blanco) {ANCHO_RAYA_ROJA}px,
+        var(--instituto-blanco) {ancho_total_rayas}px
+    );
+    padding: 2rem 0;
+    box-shadow: 0 4px 6px rgba(0,0,0,0.1);
+}}
+
+.pagina-video .header-content {{
+    background: rgba(255, 255, 255, 0.95);
+    padding: 1.5rem;
+    border-radius: 10px;
+    box-shadow: 0 4px 10px rgba(0,0,0,0.1);
+}}
+
+.pagina-video .header-content h1 {{
+    color: var(--instituto-rojo);
+    font-size: 1.5rem;
+    font-weight: 700;
+    margin: 0;
+    text-transform: uppercase;
+}}
+
+.pagina-video .video-container {{
+    position: relative;
+    width: 100%;
+    padding-bottom: 56.25%; /* Aspect ratio 16:9 */
+    margin: 2rem 0;
+    border-radius: 15px;
+    overflow: hidden;
+    box-shadow: 0 10px 30px rgba(0,0,0,0.2);
+}}
+
+.pagina-video .video-container iframe {{
+    position: absolute;
+    top: 0;
+    left: 0;
+    width: 100%;
+    height: 100%;
+    border: none;
+}}
+
+.pagina-video .video-facade {{
+    position: absolute;
+    top: 0;
+    left: 0;
+    width: 100%;
+    height: 100%;
+    display: block;
+    background: #000;
+    cursor: pointer;
+}}
+
+.pagina-video .video-facade img {{
+    width: 100%;
+    height: 100%;
+    object-fit: cover;
+}}
+
+.pagina-video .video-facade-play {{
+    position: absolute;
+    top: 50%;
+    left: 50%;
+    width: 68px;
+    height: 48px;
+    margin: -24px 0 0 -34px;
+    border-radius: 14px;
+    background: rgba(33,33,33,0.8);
+    transition: background 0.2s;
+}}
+
+.pagina-video .video-facade:hover .video-facade-play,
+.pagina-video .video-facade:focus .video-facade-play {{
+    background: #f00;
+}}
+
+.pagina-video .video-facade-play::before {{
+    content: "";
+    position: absolute;
+    top: 50%;
+    left: 50%;
+    margin: -10px 0 0 -7px;
+    border-style: solid;
+    border-width: 10px 0 10px 18px;
+    border-color: transparent transparent transparent #fff;
+}}
+
+.pagina-video .video-info {{
+    background: white;
+    padding: 2rem;
+    border-radius: 15px;
+    box-shadow: 0 5px 15px rgba(0,0,0,0.08);
+    margin-bottom: 2rem;
+}}
+
+.pagina-video .video-title {{
+    color: var(--instituto-rojo);
+    font-size: 2rem;
+    font-weight: 700;
+    margin-bottom: 1rem;
+    line-height: 1.3;
+}}
+
+.pagina-video .video-meta {{
+    color: #666;
+    font-size: 0.95rem;
+    margin-bottom: 1.5rem;
+    padding-bottom: 1.5rem;
+    border-bottom: 2px solid #f0f0f0;
+}}
+
+.pagina-video .video-meta span {{
+    display: inline-block;
+    margin-right: 1.5rem;
+}}
+
+.pagina-video .video-description {{
+    color: #555;
+    font-size: 1rem;
+    line-height: 1.6;
+    white-space: pre-wrap;
+}}
+
+.pagina-video .btn-instituto {{
+    background: var(--instituto-rojo);
+    color: white;
+    border: none;
+    padding: 0.75rem 2rem;
+    border-radius: 25px;
+    font-weight: 600;
+    text-transform: uppercase;
+    font-size: 0.9rem;
+    letter-spacing: 0.5px;
+    transition: all 0.3s ease;
+    text-decoration: none;
+    display: inline-block;
+    margin-top: 1.5rem;
+}}
+
+.pagina-video .btn-instituto:hover {{
+    background: #b30510;
+    transform: scale(1.05);
+    box-shadow: 0 5px 15px rgba(227, 6, 19, 0.3);
+    color: white;
+}}
+
+.pagina-video .btn-secondary {{
+    background: #666;
+    margin-left: 1rem;
+}}
+
+.pagina-video .btn-secondary:hover {{
+    background: #444;
+}}
+"""
+
+def stylesheet_filename(css):
+    """Nombre del archivo de estilos con el hash de su contenido"""
+    return f'site.{content_hash(css)[:12]}.css'
+
+def stylesheet_url():
+    """Ruta de la hoja de estilos para la configuración actual
+
+    Es relativa a la raíz del sitio (sin / inicial) para que las páginas
+    también se vean bien abiertas directamente desde docs/ (file://).
+    """
+    return f'assets/{stylesheet_filename(generate_stylesheet())}'
+
+def write_stylesheet(output_dir):
+    """Escribe docs/assets/site.<hash>.css
+
+    Como el nombre depende del contenido, el archivo solo se genera de nuevo
+    cuando cambian los valores de config.py que usa. Los navegadores pueden
+    cachearlo indefinidamente.
+
+    Returns:
+        Tupla (ruta de la hoja de estilos relativa a la raíz del sitio,
+               True si se escribió)
+    """
+    css = generate_stylesheet()
+    filename = stylesheet_filename(css)
+    written = write_if_changed(Path(output_dir) / 'assets' / filename, css)
+    return f'assets/{filename}', written
+
+# Plantillas HTML del sitio. Usan la sintaxis de str.format: los campos en
+# MAYÚSCULAS se completan con config.py al compilarlas (una vez por build) y
+# el resto al renderizar cada página o tarjeta.
+TEMPLATE_SOURCES = {
+    'video_page': '''<!DOCTYPE html>
 <html lang="es">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <title>{video['title']} - Instituto</title>
-    <meta name="description" content="{video['description'][:160]}">
+    <title>{title} - Instituto</title>
+    <meta name="description" content="{meta_description}">
     <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/css/bootstrap.min.css" rel="stylesheet">
-    <style>
-        :root {{
-            --instituto-rojo: {COLOR_ROJO};
-            --instituto-blanco: {COLOR_BLANCO};
-        }}
-
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif;
-            background: linear-gradient(135deg, #f5f5f5 0%, #e8e8e8 100%);
-            min-height: 100vh;
-        }}
-
-        .header-instituto {{
-            background: repeating-linear-gradient(
-                90deg,
-                var(--instituto-rojo) 0px,
-                var(--instituto-rojo) {ANCHO_RAYA_ROJA}px,
-                var(--instituto-blanco) {ANCHO_RAYA_ROJA}px,
-                var(--instituto-blanco) {ancho_total_rayas}px
-            );
-            padding: 2rem 0;
-            box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-        }}
-
-        .header-content {{
-            background: rgba(255, 255, 255, 0.95);
-            padding: 1.5rem;
-            border-radius: 10px;
-            box-shadow: 0 4px 10px rgba(0,0,0,0.1);
-        }}
-
-        .header-content h1 {{
-            color: var(--instituto-rojo);
-            font-size: 1.5rem;
-            font-weight: 700;
-            margin: 0;
-            text-transform: uppercase;
-        }}
-
-        .video-container {{
-            position: relative;
-            width: 100%;
-            padding-bottom: 56.25%; /* Aspect ratio 16:9 */
-            margin: 2rem 0;
-            border-radius: 15px;
-            overflow: hidden;
-            box-shadow: 0 10px 30px rgba(0,0,0,0.2);
-        }}
-
-        .video-container iframe {{
-            position: absolute;
-            top: 0;
-            left: 0;
-            width: 100%;
-            height: 100%;
-            border: none;
-        }}
-
-        .video-info {{
-            background: white;
-            padding: 2rem;
-            border-radius: 15px;
-            box-shadow: 0 5px 15px rgba(0,0,0,0.08);
-            margin-bottom: 2rem;
-        }}
-
-        .video-title {{
-            color: var(--instituto-rojo);
-            font-size: 2rem;
-            font-weight: 700;
-            margin-bottom: 1rem;
-            line-height: 1.3;
-        }}
-
-        .video-meta {{
-            color: #666;
-            font-size: 0.95rem;
-            margin-bottom: 1.5rem;
-            padding-bottom: 1.5rem;
-            border-bottom: 2px solid #f0f0f0;
-        }}
-
-        .video-meta span {{
-            display: inline-block;
-            margin-right: 1.5rem;
-        }}
-
-        .video-description {{
-            color: #555;
-            font-size: 1rem;
-            line-height: 1.6;
-            white-space: pre-wrap;
-        }}
-
-        .btn-instituto {{
-            background: var(--instituto-rojo);
-            color: white;
-            border: none;
-            padding: 0.75rem 2rem;
-            border-radius: 25px;
-            font-weight: 600;
-            text-transform: uppercase;
-            font-size: 0.9rem;
-            letter-spacing: 0.5px;
-            transition: all 0.3s ease;
-            text-decoration: none;
-            display: inline-block;
-            margin-top: 1.5rem;
-        }}
-
-        .btn-instituto:hover {{
-            background: #b30510;
-            transform: scale(1.05);
-            box-shadow: 0 5px 15px rgba(227, 6, 19, 0.3);
-            color: white;
-        }}
-
-        .btn-secondary {{
-            background: #666;
-            margin-left: 1rem;
-        }}
-
-        .btn-secondary:hover {{
-            background: #444;
-        }}
-    </style>
+    <link href="{stylesheet_href}" rel="stylesheet">{video_preconnect}
 </head>
-<body>
+<body class="pagina-video">
     <div class="header-instituto">
         <div class="container">
             <div class="header-content text-center">
@@ -433,26 +2424,21 @@ def generate_video_page(video, slug):
             <div class="col-lg-10 offset-lg-1">
                 <!-- Video embed -->
                 <div class="video-container">
-                    <iframe
-                        src="https://www.youtube.com/embed/{video['video_id']}?rel=0"
-                        title="{video['title']}"
-                        allow="accelerometer; autoplay; clipboard-write; encrypted-media; gyroscope; picture-in-picture"
-                        allowfullscreen>
-                    </iframe>
+                    {video_embed}
                 </div>
 
                 <!-- Video information -->
                 <div class="video-info">
-                    <h1 class="video-title">{video['title']}</h1>
+                    <h1 class="video-title">{title}</h1>
                     <div class="video-meta">
-                        <span>📺 <strong>{video['author']}</strong></span>
-                        <span>📅 {video['pub_date']}</span>
+                        <span>📺 <strong>{author}</strong></span>
+                        <span>📅 {pub_date}</span>
                     </div>
-                    <div class="video-description">{video['description']}</div>
+                    <div class="video-description">{description}</div>
 
                     <div class="mt-4">
                         <a href="/" class="btn-instituto">← Volver al inicio</a>
-                        <a href="{video['link']}" class="btn-instituto btn-secondary" target="_blank" rel="noopener">
+                        <a href="{link}" class="btn-instituto btn-secondary" target="_blank" rel="noopener">
                             Ver en YouTube ↗
                         </a>
                     </div>
@@ -463,415 +2449,8 @@ def generate_video_page(video, slug):
 
     <script src="https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/js/bootstrap.bundle.min.js"></script>
 </body>
-</html>'''
-
-    return html
-
-def generate_sitemap(base_url, video_slugs):
-    """Genera un sitemap.xml con todas las páginas del sitio
-
-    Args:
-        base_url: URL base del sitio (ej: https://ejemplo.com)
-        video_slugs: Lista de slugs de videos
-
-    Returns:
-        String con el XML del sitemap
-    """
-    # Fecha actual en formato ISO
-    today = datetime.now().strftime('%Y-%m-%d')
-
-    sitemap = '''<?xml version="1.0" encoding="UTF-8"?>
-<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
-'''
-
-    # Página principal
-    sitemap += f'''    <url>
-        <loc>{base_url}/</loc>
-        <lastmod>{today}</lastmod>
-        <changefreq>daily</changefreq>
-        <priority>1.0</priority>
-    </url>
-'''
-
-    # Páginas de videos
-    for slug in video_slugs:
-        sitemap += f'''    <url>
-        <loc>{base_url}/videos/{slug}/</loc>
-        <lastmod>{today}</lastmod>
-        <changefreq>weekly</changefreq>
-        <priority>0.8</priority>
-    </url>
-'''
-
-    sitemap += '</urlset>'
-
-    return sitemap
-
-def generate_html(noticias, fotos, agenda=[], videos=[]):
-    """Genera el HTML del sitio"""
-
-    # Calcular ancho total de rayas
-    ancho_total_rayas = ANCHO_RAYA_ROJA + ANCHO_RAYA_BLANCA
-
-    # Generar CSS con valores de configuración
-    css_content = f"""
-        :root {{
-            --instituto-rojo: {COLOR_ROJO};
-            --instituto-blanco: {COLOR_BLANCO};
-        }}
-
-        body {{
-            font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, 'Helvetica Neue', Arial, sans-serif;
-            background: linear-gradient(135deg, #f5f5f5 0%, #e8e8e8 100%);
-            min-height: 100vh;
-        }}
-
-        /* Header con rayas verticales */
-        .header-instituto {{
-            background: repeating-linear-gradient(
-                90deg,
-                var(--instituto-rojo) 0px,
-                var(--instituto-rojo) {ANCHO_RAYA_ROJA}px,
-                var(--instituto-blanco) {ANCHO_RAYA_ROJA}px,
-                var(--instituto-blanco) {ancho_total_rayas}px
-            );
-            padding: 3rem 0;
-            box-shadow: 0 4px 6px rgba(0,0,0,0.1);
-            position: relative;
-            overflow: hidden;
-        }}
-
-        .header-instituto::after {{
-            content: '';
-            position: absolute;
-            bottom: 0;
-            left: 0;
-            right: 0;
-            height: 4px;
-            background: var(--instituto-rojo);
-        }}
-
-        .header-content {{
-            background: rgba(255, 255, 255, 0.95);
-            padding: 2rem;
-            border-radius: 15px;
-            box-shadow: 0 8px 20px rgba(0,0,0,0.15);
-            backdrop-filter: blur(10px);
-        }}
-
-        h1 {{
-            color: var(--instituto-rojo);
-            font-weight: 800;
-            margin: 0;
-            font-size: 2.5rem;
-            text-transform: uppercase;
-            letter-spacing: 2px;
-        }}
-
-        .subtitle {{
-            color: #666;
-            font-size: 1.1rem;
-            margin-top: 0.5rem;
-        }}
-
-        .section-title {{
-            color: var(--instituto-rojo);
-            font-weight: 700;
-            margin: 3rem 0 1.5rem 0;
-            padding-bottom: 0.5rem;
-            border-bottom: 3px solid var(--instituto-rojo);
-            font-size: 1.8rem;
-            text-transform: uppercase;
-            letter-spacing: 1px;
-        }}
-
-        .card {{
-            border: none;
-            border-radius: 15px;
-            overflow: hidden;
-            box-shadow: 0 5px 15px rgba(0,0,0,0.08);
-            transition: all 0.3s ease;
-            height: 100%;
-            background: white;
-        }}
-
-        .card:hover {{
-            transform: translateY(-8px);
-            box-shadow: 0 12px 25px rgba(227, 6, 19, 0.2);
-        }}
-
-        .card-img-top {{
-            height: {ALTURA_IMAGEN_NOTICIA}px;
-            object-fit: cover;
-            background: linear-gradient(135deg, #f0f0f0 0%, #e0e0e0 100%);
-        }}
-
-        .card-body {{
-            padding: 1.5rem;
-        }}
-
-        .card-title {{
-            color: var(--instituto-rojo);
-            font-weight: 700;
-            font-size: 1.2rem;
-            margin-bottom: 1rem;
-            line-height: 1.4;
-        }}
-
-        .card-text {{
-            color: #555;
-            font-size: 0.95rem;
-            line-height: 1.6;
-        }}
-
-        .card-date {{
-            color: #666;
-            font-size: 0.9rem;
-            font-weight: 600;
-            margin-top: 0.8rem;
-            display: block;
-            text-transform: uppercase;
-            letter-spacing: 0.5px;
-        }}
-
-        .card-date-top {{
-            color: var(--instituto-rojo);
-            font-size: 0.85rem;
-            font-weight: 700;
-            display: block;
-            margin-bottom: 1rem;
-            text-transform: uppercase;
-            letter-spacing: 1px;
-            opacity: 0.8;
-        }}
-
-        .btn-instituto {{
-            background: var(--instituto-rojo);
-            color: white;
-            border: none;
-            padding: 0.6rem 1.5rem;
-            border-radius: 25px;
-            font-weight: 600;
-            text-transform: uppercase;
-            font-size: 0.85rem;
-            letter-spacing: 0.5px;
-            transition: all 0.3s ease;
-            text-decoration: none;
-            display: inline-block;
-            margin-top: 1rem;
-        }}
-
-        .btn-instituto:hover {{
-            background: #b30510;
-            transform: scale(1.05);
-            box-shadow: 0 5px 15px rgba(227, 6, 19, 0.3);
-            color: white;
-        }}
-
-        .footer {{
-            background: repeating-linear-gradient(
-                90deg,
-                var(--instituto-rojo) 0px,
-                var(--instituto-rojo) {ANCHO_RAYA_ROJA}px,
-                var(--instituto-blanco) {ANCHO_RAYA_ROJA}px,
-                var(--instituto-blanco) {ancho_total_rayas}px
-            );
-            padding: 2rem 0;
-            margin-top: 4rem;
-            position: relative;
-        }}
-
-        .footer::before {{
-            content: '';
-            position: absolute;
-            top: 0;
-            left: 0;
-            right: 0;
-            height: 3px;
-            background: var(--instituto-rojo);
-        }}
-
-        .footer-content {{
-            background: rgba(255, 255, 255, 0.95);
-            padding: 1.5rem;
-            border-radius: 10px;
-            text-align: center;
-        }}
-
-        .footer-content p {{
-            margin: 0.5rem 0;
-            color: #555;
-        }}
-
-        .footer-content a {{
-            color: var(--instituto-rojo);
-            font-weight: 600;
-            text-decoration: none;
-        }}
-
-        .footer-content a:hover {{
-            text-decoration: underline;
-        }}
-
-        .gallery-card .card-body {{
-            padding: 1rem;
-        }}
-
-        .gallery-card .card-title {{
-            font-size: 1rem;
-        }}
-
-        /* Estilos para noticias sin imágenes */
-        .noticia-sin-imagen {{
-            min-height: 200px;
-            background: linear-gradient(135deg, #fafafa 0%, #f5f5f5 100%);
-            border-left: 4px solid var(--instituto-rojo);
-        }}
-
-        .noticia-sin-imagen .card-body {{
-            padding: 1.5rem;
-            display: flex;
-            flex-direction: column;
-        }}
-
-        .noticia-sin-imagen .card-title {{
-            font-size: 1.15rem;
-            margin-bottom: 1rem;
-            line-height: 1.4;
-        }}
-
-        .noticia-sin-imagen .card-text {{
-            font-size: 0.95rem;
-            margin-bottom: 1.5rem;
-            flex-grow: 1;
-            line-height: 1.6;
-        }}
-
-        /* Estilos para agenda sin imágenes */
-        .agenda-card {{
-            min-height: 200px;
-            border-left: 4px solid var(--instituto-rojo);
-        }}
-
-        .agenda-card .card-body {{
-            padding: 1.5rem;
-            display: flex;
-            flex-direction: column;
-        }}
-
-        .agenda-card .card-title {{
-            font-size: 1.15rem;
-            margin-bottom: 1rem;
-            line-height: 1.4;
-        }}
-
-        .agenda-card .card-text {{
-            font-size: 0.95rem;
-            margin-bottom: 1rem;
-            flex-grow: 1;
-            line-height: 1.6;
-        }}
-
-        .agenda-card .card-date {{
-            margin-top: auto;
-        }}
-
-        /* Estilos para videos */
-        .video-card {{
-            min-height: 340px;
-        }}
-
-        .video-card .card-img-top {{
-            height: {ALTURA_IMAGEN_VIDEO}px;
-            object-fit: cover;
-            background: #000;
-        }}
-
-        .video-card .card-body {{
-            padding: 1.25rem;
-            display: flex;
-            flex-direction: column;
-        }}
-
-        .video-card .card-title {{
-            font-size: 1rem;
-            margin-bottom: 0.5rem;
-            line-height: 1.3;
-            flex-grow: 1;
-        }}
-
-        .video-card .text-muted {{
-            font-size: 0.85rem;
-            margin-bottom: 0.75rem;
-        }}
-
-        .video-card:hover {{
-            transform: translateY(-8px);
-            box-shadow: 0 12px 25px rgba(227, 6, 19, 0.25);
-        }}
-
-        .video-card:hover .card-img-top {{
-            opacity: 0.9;
-        }}
-
-        .video-card a {{
-            cursor: pointer;
-        }}
-
-        .video-card .card-title a:hover {{
-            color: var(--instituto-rojo);
-            opacity: 0.8;
-        }}
-
-        /* Estilos para bloque promocional BrizuelAMP */
-        .promo-card {{
-            min-height: 340px;
-            background: linear-gradient(135deg, #fff8f0 0%, #fff5e8 100%);
-            border: 2px solid rgba(227, 6, 19, 0.1);
-        }}
-
-        .promo-card .card-img-top {{
-            height: {ALTURA_IMAGEN_VIDEO}px;
-            object-fit: cover;
-        }}
-
-        .promo-card .card-body {{
-            padding: 1.25rem;
-            display: flex;
-            flex-direction: column;
-        }}
-
-        .promo-card .card-title {{
-            font-size: 1rem;
-            margin-bottom: 0.5rem;
-            line-height: 1.3;
-            flex-grow: 1;
-            color: var(--instituto-rojo);
-        }}
-
-        .promo-card .text-muted {{
-            font-size: 0.85rem;
-            margin-bottom: 0.75rem;
-        }}
-
-        .promo-card:hover {{
-            transform: translateY(-8px);
-            box-shadow: 0 12px 25px rgba(227, 6, 19, 0.25);
-            background: linear-gradient(135deg, #fffaf5 0%, #fff7ed 100%);
-        }}
-
-        @media (max-width: 768px) {{
-            h1 {{
-                font-size: 1.8rem;
-            }}
-
-            .section-title {{
-                font-size: 1.4rem;
-            }}
-        }}
-    """
-
-    html_content = f'''<!DOCTYPE html>
+</html>''',
+    'index_header': '''<!DOCTYPE html>
 <html lang="es">
 <head>
     <meta charset="UTF-8">
@@ -880,11 +2459,9 @@ def generate_html(noticias, fotos, agenda=[], videos=[]):
     <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/css/bootstrap.min.css" rel="stylesheet">
     <script async src="https://pagead2.googlesyndication.com/pagead/js/adsbygoogle.js?client=ca-pub-8908362383532419"
      crossorigin="anonymous"></script>
-    <style>
-        {css_content}
-    </style>
+    <link href="{stylesheet_href}" rel="stylesheet">
 </head>
-<body>
+<body class="pagina-inicio">
 
     <!-- Header -->
     <div class="header-instituto">
@@ -897,51 +2474,34 @@ def generate_html(noticias, fotos, agenda=[], videos=[]):
     </div>
 
     <div class="container py-4">
-'''
-
-    # Agregar sección de videos (PRIMERO - arriba del todo)
-    if MOSTRAR_VIDEOS and videos:
-        html_content += f'''
+''',
+    'videos_section': '''
         <!-- Videos Section -->
         <h2 class="section-title">{TITULO_VIDEOS}</h2>
         <div class="row g-4 mb-5">
-'''
-        for idx, video in enumerate(videos):
-            # Thumbnail del video
-            if video['image']:
-                img_html = f'<img src="{video["image"]}" class="card-img-top" alt="{video["title"]}">'
-            else:
-                img_html = '<div class="card-img-top d-flex align-items-center justify-content-center bg-dark"><span style="font-size: 3rem; filter: brightness(1.2);">▶️</span></div>'
-
-            # Generar slug para la URL interna del video
-            video_slug = create_slug(video['title'])
-            video_url = f"/videos/{video_slug}/"
-
-            html_content += f'''
+''',
+    'video_card': '''
             <div class="col-md-{COLUMNAS_VIDEOS}">
                 <div class="card video-card">
                     <a href="{video_url}" style="text-decoration: none;">
                         {img_html}
                     </a>
                     <div class="card-body">
-                        <small class="card-date-top">{video['pub_date']}</small>
+                        <small class="card-date-top">{pub_date}</small>
                         <h5 class="card-title">
                             <a href="{video_url}" style="text-decoration: none; color: inherit;">
-                                {video['title']}
+                                {title}
                             </a>
                         </h5>
-                        <p class="text-muted">📺 {video['author']}</p>
+                        <p class="text-muted">📺 {author}</p>
                         <a href="{video_url}" class="btn-instituto">
                             Ver video →
                         </a>
                     </div>
                 </div>
             </div>
-'''
-
-            # Insertar bloque de BrizuelAMP después del primer video
-            if idx == 0:
-                html_content += f'''
+''',
+    'promo_card': '''
             <div class="col-md-{COLUMNAS_VIDEOS}">
                 <div class="card promo-card">
                     <img src="/imgs/brizuelamp.png" class="card-img-top" alt="Vivi los partidos sin subtitulos">
@@ -958,116 +2518,83 @@ def generate_html(noticias, fotos, agenda=[], videos=[]):
                     </div>
                 </div>
             </div>
-'''
-
-        html_content += '''
+''',
+    'section_end': '''
         </div>
-'''
-
-    # Agregar sección de noticias
-    if MOSTRAR_NOTICIAS and noticias:
-        html_content += f'''
+''',
+    'news_section': '''
         <!-- Noticias Section -->
         <h2 class="section-title">{TITULO_NOTICIAS}</h2>
         <div class="row g-4 mb-5">
-'''
-        for noticia in noticias:
-            if noticia['image']:
-                # Noticia con imagen - diseño completo
-                html_content += f'''
+''',
+    'news_card_image': '''
             <div class="col-md-{COLUMNAS_NOTICIAS}">
                 <div class="card">
-                    <img src="{noticia['image']}" class="card-img-top" alt="{noticia['title']}">
+                    {img_html}
                     <div class="card-body">
-                        <h5 class="card-title">{noticia['title']}</h5>
-                        <p class="card-text">{noticia['description']}</p>
-                        <small class="card-date">{noticia['pub_date']}</small>
-                        <a href="{noticia['link']}" class="btn-instituto" target="_blank" rel="noopener">
+                        <h5 class="card-title">{title}</h5>
+                        <p class="card-text">{description}</p>
+                        <small class="card-date">{pub_date}</small>
+                        <a href="{link}" class="btn-instituto" target="_blank" rel="noopener">
                             {TEXTO_BOTON}
                         </a>
                     </div>
                 </div>
             </div>
-'''
-            else:
-                # Noticia sin imagen - diseño compacto tipo agenda
-                html_content += f'''
+''',
+    'news_card_text': '''
             <div class="col-md-{COLUMNAS_NOTICIAS}">
                 <div class="card noticia-sin-imagen">
                     <div class="card-body">
-                        <small class="card-date-top">{noticia['pub_date']}</small>
-                        <h5 class="card-title">{noticia['title']}</h5>
-                        <p class="card-text">{noticia['description']}</p>
-                        <a href="{noticia['link']}" class="btn-instituto" target="_blank" rel="noopener">
+                        <small class="card-date-top">{pub_date}</small>
+                        <h5 class="card-title">{title}</h5>
+                        <p class="card-text">{description}</p>
+                        <a href="{link}" class="btn-instituto" target="_blank" rel="noopener">
                             {TEXTO_BOTON}
                         </a>
                     </div>
                 </div>
             </div>
-'''
-        html_content += '''
-        </div>
-'''
-
-    # Agregar sección de fotos
-    if MOSTRAR_FOTOS and fotos:
-        html_content += f'''
+''',
+    'photos_section': '''
         <!-- Galería Section -->
         <h2 class="section-title">{TITULO_FOTOS}</h2>
         <div class="row g-4 mb-5">
-'''
-        for foto in fotos:
-            if foto['image']:
-                img_html = f'<img src="{foto["image"]}" class="card-img-top" alt="{foto["title"]}">'
-            else:
-                img_html = '<div class="card-img-top d-flex align-items-center justify-content-center bg-light"><span style="font-size: 3rem;">📷</span></div>'
-
-            html_content += f'''
+''',
+    'photo_card': '''
             <div class="col-md-{COLUMNAS_FOTOS}">
                 <div class="card gallery-card">
                     {img_html}
                     <div class="card-body">
-                        <h5 class="card-title">{foto['title']}</h5>
-                        <small class="card-date">{foto['pub_date']}</small>
-                        <a href="{foto['link']}" class="btn-instituto" target="_blank" rel="noopener">
+                        <h5 class="card-title">{title}</h5>
+                        <small class="card-date">{pub_date}</small>
+                        <a href="{link}" class="btn-instituto" target="_blank" rel="noopener">
                             {TEXTO_BOTON_FOTOS}
                         </a>
                     </div>
                 </div>
             </div>
-'''
-        html_content += '''
-        </div>
-'''
-
-    # Agregar sección de agenda
-    if MOSTRAR_AGENDA and agenda:
-        html_content += f'''
+''',
+    'agenda_section': '''
         <!-- Agenda Section -->
         <h2 class="section-title">{TITULO_AGENDA}</h2>
         <div class="row g-4 mb-5">
-'''
-        for evento in agenda:
-            # Agenda sin imágenes, solo contenido de texto
-            html_content += f'''
+''',
+    'agenda_card': '''
             <div class="col-md-{COLUMNAS_AGENDA}">
                 <div class="card agenda-card">
                     <div class="card-body">
-                        <h5 class="card-title">{evento['title']}</h5>
-                        <p class="card-text">{evento['description']}</p>
-                        <small class="card-date">{evento['pub_date']}</small>
-                        <a href="{evento['link']}" class="btn-instituto" target="_blank" rel="noopener">
+                        <h5 class="card-title">{title}</h5>
+                        <p class="card-text">{description}</p>
+                        <small class="card-date">{pub_date}</small>
+                        <a href="{link}" class="btn-instituto" target="_blank" rel="noopener">
                             Ver más →
                         </a>
                     </div>
                 </div>
             </div>
-'''
-        html_content += '''
-        </div>
-'''
-
-    html_content += '''
+''',
+    'index_footer': '''
     </div>
 
     <!-- Footer -->
@@ -1084,15 +2611,851 @@ def generate_html(noticias, fotos, agenda=[], videos=[]):
     <script src="https://cdn.jsdelivr.net/npm/bootstrap@5.3.0/dist/js/bootstrap.bundle.min.js"></script>
 </body>
 </html>
+''',
+    'card_image': '<img src="{image}" class="card-img-top" alt="{title}">',
+    'card_picture': '<picture><source srcset="{image_webp}" type="image/webp"><img src="{image}" width="{image_width}" height="{image_height}" class="card-img-top" alt="{title}"></picture>',
+    'video_card_image': '<img src="{thumbnail}" srcset="{srcset}" sizes="{sizes}" width="{width}" height="{height}" class="card-img-top" alt="{title}"{lazy}>',
+}
+
+class Template:
+    """Plantilla HTML precompilada
+
+    El texto se parsea una sola vez (con la sintaxis de str.format) en una
+    lista de partes literales y campos. render_into() agrega las partes a
+    una lista de salida, así armar una página es lineal en la cantidad de
+    tarjetas en lugar de concatenar strings cada vez más largos.
+    """
+
+    _formatter = string.Formatter()
+
+    def __init__(self, source, constants=None):
+        """
+        Args:
+            source: Texto de la plantilla
+            constants: Dict con valores que se fijan al compilar (ej: config.py)
+        """
+        constants = constants or {}
+        parts = []
+        literal_buffer = []
+        for literal, field, format_spec, conversion in self._formatter.parse(source):
+            literal_buffer.append(literal)
+            if field is None:
+                continue
+            if format_spec or conversion or not field.isidentifier():
+                raise ValueError(f"Campo no soportado en plantilla: {{{field}}}")
+            if field in constants:
+                literal_buffer.append(str(constants[field]))
+                continue
+            parts.append((''.join(literal_buffer), field))
+            literal_buffer = []
+
+        self.parts = parts
+        self.tail = ''.join(literal_buffer)
+        self.fields = {field for _, field in parts}
+
+    def render_into(self, out, values=None, **extra):
+        """Agrega la plantilla renderizada a la lista `out`
+
+        Los campos se buscan primero en `extra` y después en `values`.
+        """
+        append = out.append
+        for literal, field in self.parts:
+            append(literal)
+            append(str(extra[field] if field in extra else values[field]))
+        append(self.tail)
+
+    def render(self, values=None, **extra):
+        """Devuelve la plantilla renderizada como string"""
+        out = []
+        self.render_into(out, values, **extra)
+        return ''.join(out)
+
+# Valores de config.py que usan las plantillas (campos en MAYÚSCULAS)
+TEMPLATE_CONFIG_KEYS = sorted({
+    field
+    for source in TEMPLATE_SOURCES.values()
+    for field in Template(source).fields
+    if field.isupper()
+})
+
+@functools.lru_cache(maxsize=4)
+def _compile_templates(config_items):
+    config_values = dict(config_items)
+    return {name: Template(source, config_values) for name, source in TEMPLATE_SOURCES.items()}
+
+def site_templates():
+    """Plantillas compiladas con la configuración actual
+
+    Se compilan una sola vez y se reusan mientras config.py no cambie.
+    """
+    return _compile_templates(tuple((key, globals()[key]) for key in TEMPLATE_CONFIG_KEYS))
+
+# Miniaturas que publica YouTube para cada video: (nombre, ancho, alto)
+YOUTUBE_THUMBNAILS = (
+    ('default', 120, 90),
+    ('mqdefault', 320, 180),
+    ('hqdefault', 480, 360),
+    ('sddefault', 640, 480),
+)
+# Miniatura del src (para navegadores sin srcset y para width/height)
+YOUTUBE_THUMBNAIL_DEFAULT = ('mqdefault', 320, 180)
+
+# Ancho máximo de .container de Bootstrap 5 por breakpoint y separación entre columnas (g-4)
+BOOTSTRAP_CONTAINERS = ((1400, 1320), (1200, 1140), (992, 960), (768, 720), (576, 540))
+BOOTSTRAP_BREAKPOINT_MD = 768
+BOOTSTRAP_GUTTER = 24
+
+def youtube_thumbnail_srcset(video_id):
+    """Atributo srcset con todas las miniaturas de YouTube de un video"""
+    return ', '.join(
+        f'https://i.ytimg.com/vi/{video_id}/{name}.jpg {width}w'
+        for name, width, height in YOUTUBE_THUMBNAILS
+    )
+
+@functools.lru_cache(maxsize=None)
+def video_card_sizes(columns, image_height):
+    """Atributo sizes de las miniaturas de las tarjetas de videos
+
+    Es el ancho de la tarjeta en cada breakpoint (col-md-{columns}, a ancho
+    completo debajo de md). Como la miniatura se recorta con object-fit: cover
+    a image_height px de alto, nunca se pide menos ancho que el de una
+    miniatura 4:3 de esa altura.
+    """
+    min_width = -(-image_height * 4 // 3)
+    sizes = []
+    for breakpoint, container in BOOTSTRAP_CONTAINERS:
+        span = columns if breakpoint >= BOOTSTRAP_BREAKPOINT_MD else 12
+        width = max(container * span // 12 - BOOTSTRAP_GUTTER, min_width)
+        sizes.append(f'(min-width: {breakpoint}px) {width}px')
+    sizes.append(f'calc(100vw - {BOOTSTRAP_GUTTER}px)')
+    return ', '.join(sizes)
+
+# Reemplazos de la imagen de una tarjeta cuando el item no tiene imagen
+VIDEO_IMAGE_PLACEHOLDER = '<div class="card-img-top d-flex align-items-center justify-content-center bg-dark"><span style="font-size: 3rem; filter: brightness(1.2);">▶️</span></div>'
+PHOTO_IMAGE_PLACEHOLDER = '<div class="card-img-top d-flex align-items-center justify-content-center bg-light"><span style="font-size: 3rem;">📷</span></div>'
+
+# Permisos del iframe de YouTube (los mismos con y sin fachada)
+YOUTUBE_IFRAME_ALLOW = 'accelerometer; autoplay; clipboard-write; encrypted-media; gyroscope; picture-in-picture'
+
+# Cambia la fachada por el iframe al hacer clic. Sin JavaScript el enlace
+# lleva al video en YouTube.
+YOUTUBE_FACADE_SCRIPT = f'''<script>
+document.querySelectorAll('.video-facade').forEach(function (facade) {{
+    facade.addEventListener('click', function (event) {{
+        event.preventDefault();
+        var iframe = document.createElement('iframe');
+        iframe.src = facade.dataset.embed;
+        iframe.title = facade.dataset.title;
+        iframe.allow = '{YOUTUBE_IFRAME_ALLOW}';
+        iframe.allowFullscreen = true;
+        facade.replaceWith(iframe);
+    }});
+}});
+</script>'''
+
+def youtube_embed_host():
+    """Dominio del reproductor embebido (youtube-nocookie.com si YOUTUBE_NOCOOKIE)"""
+    return 'https://www.youtube-nocookie.com' if YOUTUBE_NOCOOKIE else 'https://www.youtube.com'
+
+def video_embed_html(video):
+    """Genera el reproductor de una página de video
+
+    Con YOUTUBE_FACADE se muestra solo la miniatura con un botón de play y el
+    iframe de YouTube (y todo su JavaScript) se carga recién al hacer clic.
+
+    Args:
+        video: Dict con información del video (title, video_id, link, image)
+
+    Returns:
+        String con el HTML del reproductor
+    """
+    embed_url = f"{youtube_embed_host()}/embed/{video['video_id']}?rel=0"
+    if not YOUTUBE_FACADE:
+        return (f'<iframe src="{embed_url}" title="{video["title"]}" '
+                f'allow="{YOUTUBE_IFRAME_ALLOW}" allowfullscreen></iframe>')
+
+    poster = video.get('image') or f"https://i.ytimg.com/vi/{video['video_id']}/hqdefault.jpg"
+    return f'''<a class="video-facade" href="{video['link']}" data-embed="{embed_url}&amp;autoplay=1" data-title="{video['title']}" aria-label="Reproducir: {video['title']}">
+                        <img src="{poster}" alt="{video['title']}" width="480" height="360">
+                        <span class="video-facade-play"></span>
+                    </a>
+                    {YOUTUBE_FACADE_SCRIPT}'''
+
+def video_preconnect_html():
+    """Pre-conexiones a YouTube para que el reproductor arranque más rápido
+
+    Returns:
+        String con los <link rel="preconnect"> (vacío si YOUTUBE_PRECONNECT es False)
+    """
+    if not YOUTUBE_PRECONNECT:
+        return ''
+    hosts = [youtube_embed_host(), 'https://i.ytimg.com']
+    return ''.join(f'\n    <link rel="preconnect" href="{host}">' for host in hosts)
+
+# Campos del video que la página usa fuera de la plantilla (embed, póster y
+# meta description); video_page_hash() los incluye en el hash
+VIDEO_PAGE_FIELDS = ('video_id', 'title', 'link', 'image', 'description')
+
+# Las páginas de videos están en videos/<slug>/index.html: sus enlaces
+# relativos a la raíz del sitio llevan este prefijo
+VIDEO_PAGE_ROOT = '../../'
+
+def generate_video_page(video, slug, stylesheet_href=None):
+    """Genera una página HTML individual para un video de YouTube
+
+    Args:
+        video: Dict con información del video (title, video_id, author, pub_date, description)
+        slug: Slug URL-friendly para la página
+        stylesheet_href: Ruta de la hoja de estilos compartida relativa a la
+                         raíz del sitio (default: stylesheet_url())
+
+    Returns:
+        String con el HTML completo de la página
+    """
+    if stylesheet_href is None:
+        stylesheet_href = stylesheet_url()
+
+    return site_templates()['video_page'].render(
+        video,
+        meta_description=video['description'][:160],
+        stylesheet_href=VIDEO_PAGE_ROOT + stylesheet_href,
+        video_embed=video_embed_html(video),
+        video_preconnect=video_preconnect_html()
+    )
+
+def render_video_pages(videos_dir, stylesheet_href, pages):
+    """Genera y escribe un bloque de páginas de videos
+
+    Es la unidad de trabajo de rebuild_video_pages(): corre en un proceso
+    aparte, por eso recibe todo lo que necesita como argumentos.
+
+    Returns:
+        Tupla (cantidad de archivos escritos, MinifyReport del bloque); los
+        archivos que no cambiaron no se tocan
+    """
+    videos_dir = Path(videos_dir)
+    report = MinifyReport()
+    written = 0
+    for slug, video in pages:
+        if write_html(videos_dir / slug / 'index.html', generate_video_page(video, slug, stylesheet_href), report):
+            written += 1
+    return written, report
+
+def rebuild_video_pages(pages, videos_dir, stylesheet_href, max_workers=None, chunk_size=None):
+    """Regenera muchas páginas de videos repartiéndolas entre procesos
+
+    Las páginas se envían al ProcessPoolExecutor en bloques (no de a una),
+    así el costo de pasar datos entre procesos se reparte entre varias.
+
+    Args:
+        pages: Lista de tuplas (slug, video)
+        videos_dir: Directorio docs/videos/
+        stylesheet_href: Ruta de la hoja de estilos compartida (relativa a la raíz)
+        max_workers: Procesos (default: PROCESOS_REBUILD o un proceso por núcleo)
+        chunk_size: Páginas por bloque (default: ~4 bloques por proceso, hasta 500)
+
+    Returns:
+        Cantidad de archivos escritos
+    """
+    if not pages:
+        return 0
+
+    max_workers = max_workers or PROCESOS_REBUILD or os.cpu_count() or 1
+    if chunk_size is None:
+        chunk_size = max(1, min(500, -(-len(pages) // (max_workers * 4))))
+    chunks = [pages[i:i + chunk_size] for i in range(0, len(pages), chunk_size)]
+
+    written = 0
+
+    # Con un solo bloque no vale la pena levantar procesos
+    if max_workers == 1 or len(chunks) == 1:
+        for chunk in chunks:
+            chunk_written, report = render_video_pages(videos_dir, stylesheet_href, chunk)
+            written += chunk_written
+            MINIFY_REPORT.merge(report)
+        return written
+
+    with ProcessPoolExecutor(max_workers=min(max_workers, len(chunks))) as executor:
+        futures = [
+            executor.submit(render_video_pages, str(videos_dir), stylesheet_href, chunk)
+            for chunk in chunks
+        ]
+        for future in as_completed(futures):
+            chunk_written, report = future.result()
+            written += chunk_written
+            MINIFY_REPORT.merge(report)
+    return written
+
+def sitemap_lastmod(page):
+    """Fecha (YYYY-MM-DD) de última modificación de una página de video
+
+    Usa la fecha en que cambiaron los datos del video (`modified`) si
+    cambiaron después de agregarlo al catálogo, y si no la de publicación.
+    """
+    if page.get('modified'):
+        return page['modified'][:10]
+    return (page['published'] or page['first_seen'] or '')[:10]
+
+class SitemapWriter:
+    """Escribe el sitemap en partes (shards) de tamaño acotado más un índice
+
+    Cada parte (sitemap-N.xml) tiene como máximo `max_urls` URLs y
+    `max_bytes` bytes. El archivo sitemap.xml es un sitemap index que apunta
+    a todas las partes. Las partes cuyo contenido no cambió no se reescriben.
+    """
+
+    URLSET_HEADER = '''<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+'''
+    URLSET_FOOTER = '</urlset>'
+
+    def __init__(self, output_dir, base_url, max_urls=None, max_bytes=None):
+        self.output_dir = Path(output_dir)
+        self.base_url = base_url
+        self.max_urls = max_urls or SITEMAP_URLS_POR_ARCHIVO
+        self.max_bytes = max_bytes or SITEMAP_MAX_BYTES
+        self.shards = []  # Lista de (nombre de archivo, lastmod)
+        self.urls = 0
+        self.written = 0
+        self._parts = []
+        self._size = 0
+        self._lastmod = ''
+
+    def add(self, loc, lastmod, changefreq, priority):
+        """Agrega una URL al shard actual (abre uno nuevo si está lleno)"""
+        entry = f'''    <url>
+        <loc>{self.base_url}{loc}</loc>
 '''
+        if lastmod:
+            entry += f'''        <lastmod>{lastmod}</lastmod>
+'''
+        entry += f'''        <changefreq>{changefreq}</changefreq>
+        <priority>{priority}</priority>
+    </url>
+'''
+        entry_size = len(entry.encode('utf-8'))
+        overhead = len(self.URLSET_HEADER) + len(self.URLSET_FOOTER)
+        if self._parts and (len(self._parts) >= self.max_urls or
+                            self._size + entry_size + overhead > self.max_bytes):
+            self._flush_shard()
+
+        self._parts.append(entry)
+        self._size += entry_size
+        self._lastmod = max(self._lastmod, lastmod or '')
+        self.urls += 1
+
+    def _flush_shard(self):
+        name = f'sitemap-{len(self.shards) + 1}.xml'
+        content = self.URLSET_HEADER + ''.join(self._parts) + self.URLSET_FOOTER
+        if write_if_changed(self.output_dir / name, content):
+            self.written += 1
+        self.shards.append((name, self._lastmod))
+        self._parts = []
+        self._size = 0
+        self._lastmod = ''
+
+    def close(self):
+        """Escribe el último shard, el índice y borra shards sobrantes"""
+        if self._parts or not self.shards:
+            self._flush_shard()
+
+        index = ['''<?xml version="1.0" encoding="UTF-8"?>
+<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+''']
+        for name, lastmod in self.shards:
+            index.append(f'''    <sitemap>
+        <loc>{self.base_url}/{name}</loc>
+''')
+            if lastmod:
+                index.append(f'''        <lastmod>{lastmod}</lastmod>
+''')
+            index.append('''    </sitemap>
+''')
+        index.append('</sitemapindex>')
+        if write_if_changed(self.output_dir / 'sitemap.xml', ''.join(index)):
+            self.written += 1
+
+        # Borrar shards de ejecuciones anteriores que ya no se usan
+        current = {name for name, _ in self.shards}
+        for old_shard in self.output_dir.glob('sitemap-*.xml'):
+            if old_shard.name not in current:
+                old_shard.unlink()
+
+def generate_sitemap(output_dir, base_url, video_pages):
+    """Genera sitemap.xml (índice) y sus partes con todas las páginas del sitio
 
-    return html_content
+    Args:
+        output_dir: Directorio de salida (docs/)
+        base_url: URL base del sitio (ej: https://ejemplo.com)
+        video_pages: Lista de dicts con slug, published, first_seen y modified
+                     (ver catalog_pages), de más viejo a más nuevo para que
+                     los videos nuevos solo modifiquen el último shard
 
+    Returns:
+        SitemapWriter ya cerrado (con cantidad de URLs, shards y escritos)
+    """
+    lastmods = [sitemap_lastmod(page) for page in video_pages]
 
-def main():
-    """Función principal"""
-    print("🔴⚪ Generando sitio de Instituto...")
+    writer = SitemapWriter(output_dir, base_url)
+
+    # Páginas de videos
+    for page, lastmod in zip(video_pages, lastmods):
+        writer.add(f"/videos/{page['slug']}/", lastmod, 'weekly', '0.8')
+
+    # Página principal: cambia cada vez que aparece un video nuevo, por eso
+    # va al final (en el último shard, que es el que cambia de todas formas)
+    home_lastmod = max(lastmods, default='') or datetime.now().strftime('%Y-%m-%d')
+    writer.add('/', home_lastmod, 'daily', '1.0')
+
+    writer.close()
+    return writer
+
+def card_image_html(templates, item):
+    """Imagen de una tarjeta de noticia o foto (copias locales si las hay)"""
+    if item.get('image_webp'):
+        return templates['card_picture'].render(item)
+    return templates['card_image'].render(item)
+
+def generate_html(noticias, fotos, agenda=[], videos=[], stylesheet_href=None):
+    """Genera el HTML del sitio
+
+    stylesheet_href es la ruta de la hoja de estilos compartida, relativa a
+    la raíz del sitio (si no se indica se calcula a partir de la configuración).
+    """
+
+    if stylesheet_href is None:
+        stylesheet_href = stylesheet_url()
+
+    templates = site_templates()
+    out = []
+    templates['index_header'].render_into(out, stylesheet_href=stylesheet_href)
+
+    # Agregar sección de videos (PRIMERO - arriba del todo)
+    if MOSTRAR_VIDEOS and videos:
+        templates['videos_section'].render_into(out)
+        # Las tarjetas de la primera fila (contando el bloque de BrizuelAMP)
+        # se ven al abrir la página, las demás cargan su miniatura en diferido
+        cards_per_row = 12 // COLUMNAS_VIDEOS
+        thumbnail_name, thumbnail_width, thumbnail_height = YOUTUBE_THUMBNAIL_DEFAULT
+        sizes = video_card_sizes(COLUMNAS_VIDEOS, ALTURA_IMAGEN_VIDEO)
+        for idx, video in enumerate(videos):
+            # Thumbnail del video
+            if video['image'] and video.get('video_id'):
+                position = idx + 1 if idx else idx
+                img_html = templates['video_card_image'].render(
+                    video,
+                    thumbnail=f"https://i.ytimg.com/vi/{video['video_id']}/{thumbnail_name}.jpg",
+                    srcset=youtube_thumbnail_srcset(video['video_id']),
+                    sizes=sizes,
+                    width=thumbnail_width,
+                    height=thumbnail_height,
+                    lazy=' loading="lazy" decoding="async"' if position >= cards_per_row else ''
+                )
+            elif video['image']:
+                img_html = templates['card_image'].render(video)
+            else:
+                img_html = VIDEO_IMAGE_PLACEHOLDER
+
+            # Generar slug para la URL interna del video
+            video_slug = create_slug(video['title'])
+            video_url = f"/videos/{video_slug}/"
+
+            templates['video_card'].render_into(out, video, img_html=img_html, video_url=video_url)
 
+            # Insertar bloque de BrizuelAMP después del primer video
+            if idx == 0:
+                templates['promo_card'].render_into(out)
+
+        templates['section_end'].render_into(out)
+
+    # Agregar sección de noticias
+    if MOSTRAR_NOTICIAS and noticias:
+        templates['news_section'].render_into(out)
+        for noticia in noticias:
+            if noticia['image']:
+                # Noticia con imagen - diseño completo
+                templates['news_card_image'].render_into(out, noticia, img_html=card_image_html(templates, noticia))
+            else:
+                # Noticia sin imagen - diseño compacto tipo agenda
+                templates['news_card_text'].render_into(out, noticia)
+        templates['section_end'].render_into(out)
+
+    # Agregar sección de fotos
+    if MOSTRAR_FOTOS and fotos:
+        templates['photos_section'].render_into(out)
+        for foto in fotos:
+            if foto['image']:
+                img_html = card_image_html(templates, foto)
+            else:
+                img_html = PHOTO_IMAGE_PLACEHOLDER
+
+            templates['photo_card'].render_into(out, foto, img_html=img_html)
+        templates['section_end'].render_into(out)
+
+    # Agregar sección de agenda
+    if MOSTRAR_AGENDA and agenda:
+        templates['agenda_section'].render_into(out)
+        for evento in agenda:
+            # Agenda sin imágenes, solo contenido de texto
+            templates['agenda_card'].render_into(out, evento)
+        templates['section_end'].render_into(out)
+
+    templates['index_footer'].render_into(out)
+
+    return ''.join(out)
+
+
+def precompress_formats():
+    """Formatos de precompresión disponibles: {sufijo: (comprimir, descomprimir)}"""
+    formats = {'.gz': (lambda data: gzip.compress(data, compresslevel=9, mtime=0), gzip.decompress)}
+    if brotli is not None:
+        formats['.br'] = (lambda data: brotli.compress(data, quality=11), brotli.decompress)
+    return formats
+
+def precompress_outputs(output_dir, manifest=None):
+    """Escribe variantes .gz (y .br si está el módulo brotli) de los archivos de docs/
+
+    Una variante está al día si el manifest tiene registrado el hash del
+    contenido actual del original o, si no hay registro (ej: un checkout
+    nuevo en CI), si al descomprimirla da el mismo contenido. Solo se
+    comprimen de nuevo los archivos que cambiaron. Las variantes que no
+    achican el archivo no se guardan y las que quedaron viejas o sin
+    original se borran, para que el servidor nunca sirva contenido viejo.
+
+    Args:
+        output_dir: Directorio docs/
+        manifest: OutputManifest donde se registran los hashes (default: uno nuevo)
+
+    Returns:
+        Tupla (archivos comprimidos en este build,
+               {sufijo: [bytes originales, bytes comprimidos]} de todas las variantes)
+    """
+    output_dir = Path(output_dir)
+    manifest = manifest or OutputManifest()
+    formats = precompress_formats()
+    compressed = 0
+    totals = {suffix: [0, 0] for suffix in formats}
+
+    for path in sorted(output_dir.rglob('*')):
+        if path.suffix in PRECOMPRESS_SUFFIXES:
+            source = path.with_suffix('')
+            if source.suffix in PRECOMPRESS_EXTENSIONS and not source.exists():
+                path.unlink()
+                manifest.forget(path)
+            continue
+        if path.suffix not in PRECOMPRESS_EXTENSIONS or not path.is_file():
+            continue
+
+        data = path.read_bytes()
+        digest = content_hash(data)
+        for suffix in PRECOMPRESS_SUFFIXES:
+            sibling = path.with_name(path.name + suffix)
+            current = manifest.recorded(sibling) == digest
+            if suffix not in formats:
+                # Sin el módulo no se puede verificar ni regenerar
+                if sibling.exists() and not current:
+                    sibling.unlink()
+                    manifest.forget(sibling)
+                continue
+
+            compress, decompress = formats[suffix]
+            if not current and sibling.exists():
+                try:
+                    current = decompress(sibling.read_bytes()) == data
+                except Exception:
+                    current = False
+            if not current:
+                packed = compress(data)
+                if len(packed) < len(data):
+                    sibling.write_bytes(packed)
+                    compressed += 1
+                elif sibling.exists():
+                    sibling.unlink()
+            manifest.update(sibling, digest)
+
+            if sibling.exists():
+                totals[suffix][0] += len(data)
+                totals[suffix][1] += sibling.stat().st_size
+
+    return compressed, totals
+
+def remove_precompressed(output_dir, manifest=None):
+    """Borra las variantes .gz/.br de docs/ (ej: al desactivar PRECOMPRIMIR)
+
+    Si quedaran, un servidor que sirve archivos precomprimidos seguiría
+    sirviendo el contenido viejo de las páginas que cambiaron. Solo se
+    borran las variantes de archivos con extensión de PRECOMPRESS_EXTENSIONS.
+
+    Returns:
+        Cantidad de archivos borrados
+    """
+    manifest = manifest or OutputManifest()
+    removed = 0
+    for path in sorted(Path(output_dir).rglob('*')):
+        if path.suffix in PRECOMPRESS_SUFFIXES and path.with_suffix('').suffix in PRECOMPRESS_EXTENSIONS:
+            path.unlink()
+            manifest.forget(path)
+            removed += 1
+    return removed
+
+def load_image_index():
+    """Índice de la caché de imágenes
+
+    Returns:
+        Dict {'urls': {url: archivo en IMAGE_CACHE_DIR},
+              'variants': {copia en docs/imgs/cache: [ancho, alto]}}
+    """
+    try:
+        index = json.loads(IMAGE_CACHE_INDEX.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        index = {}
+    index.setdefault('urls', {})
+    index.setdefault('variants', {})
+    return index
+
+def save_image_index(index):
+    write_if_changed(IMAGE_CACHE_INDEX, json.dumps(index, indent=2, sort_keys=True))
+
+def fetch_image(url, policy):
+    """Descarga una imagen a la caché, con el hash de su contenido como nombre
+
+    Returns:
+        Nombre del archivo en IMAGE_CACHE_DIR
+    """
+    host = urllib.parse.urlparse(url).netloc
+    timeout = policy.timeout_for(host)
+    if timeout <= 0:
+        raise TimeoutError("plazo total agotado")
+
+    start = time.monotonic()
+    req = urllib.request.Request(url, headers={'User-Agent': 'Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36'})
+    with urllib.request.urlopen(req, timeout=timeout) as response:
+        content_type = response.headers.get_content_type()
+        if not content_type.startswith('image/'):
+            raise ValueError(f"no es una imagen ({content_type})")
+        data = response.read()
+    policy.record(host, time.monotonic() - start)
+
+    suffix = Path(urllib.parse.urlparse(url).path).suffix.lower()
+    if suffix not in IMAGE_EXTENSIONS:
+        suffix = mimetypes.guess_extension(content_type) or '.img'
+    filename = hashlib.sha256(data).hexdigest() + suffix
+    cache_file = IMAGE_CACHE_DIR / filename
+    if not cache_file.exists():
+        temp_file = cache_file.with_name(filename + '.tmp')
+        temp_file.write_bytes(data)
+        os.replace(temp_file, cache_file)
+    return filename
+
+def download_card_images(urls, max_workers=None, max_per_host=None):
+    """Etapa fetch: baja a la caché las imágenes que todavía no están
+
+    Cada imagen se pide una sola vez: las URLs que ya figuran en el índice
+    (y cuyo archivo sigue en la caché) no se vuelven a descargar. Una imagen
+    que falla queda enlazada a la original y se reintenta en el próximo fetch.
+    Con DOWNLOAD_FEED=False no se descarga nada (se usa lo que ya está).
+
+    Returns:
+        Cantidad de imágenes descargadas
+    """
+    index = load_image_index()
+    pending = sorted({
+        url for url in urls
+        if url and not (url in index['urls'] and (IMAGE_CACHE_DIR / index['urls'][url]).exists())
+    })
+    if not pending:
+        return 0
+    if not DOWNLOAD_FEED:
+        log(f"  → Omitiendo descarga de {len(pending)} imágenes (DOWNLOAD_FEED=False)")
+        return 0
+
+    IMAGE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    max_per_host = max_per_host or DESCARGAS_POR_HOST
+    host_limits = {}
+    for url in pending:
+        host_limits.setdefault(urllib.parse.urlparse(url).netloc, threading.BoundedSemaphore(max_per_host))
+    policy = FetchPolicy()
+
+    def fetch(url):
+        with host_limits[urllib.parse.urlparse(url).netloc]:
+            with PROFILER.phase('download_image', url=url):
+                return fetch_image(url, policy)
+
+    downloaded = 0
+    with ThreadPoolExecutor(max_workers=min(max_workers or DESCARGAS_CONCURRENTES, len(pending))) as executor:
+        futures = {executor.submit(fetch, url): url for url in pending}
+        for future in as_completed(futures):
+            url = futures[future]
+            try:
+                index['urls'][url] = future.result()
+                downloaded += 1
+            except Exception as e:
+                log(f"  ✗ No se pudo descargar la imagen {url}: {e}")
+
+    save_image_index(index)
+    return downloaded
+
+def encode_card_image(source, output_dir, stem, height):
+    """Genera las copias WebP y JPEG de una imagen achicada a `height` px de alto
+
+    Nunca agranda la imagen. Cada archivo se escribe en un temporal y se
+    renombra, así un build cortado no deja copias a medias.
+
+    Returns:
+        Tupla (ancho, alto) de las copias
+    """
+    with Image.open(source) as original:
+        image = ImageOps.exif_transpose(original)
+        # Antes de achicar: con paleta (P) u otros modos Pillow usa NEAREST
+        if image.mode not in ('RGB', 'RGBA'):
+            image = image.convert('RGBA' if 'A' in image.getbands() or 'transparency' in image.info else 'RGB')
+        if image.height > height:
+            width = max(1, round(image.width * height / image.height))
+            image = image.resize((width, height), Image.LANCZOS)
+        if image.mode == 'RGBA':
+            # JPEG no tiene transparencia: se compone sobre fondo blanco
+            flat = Image.new('RGB', image.size, (255, 255, 255))
+            flat.paste(image, mask=image.getchannel('A'))
+        else:
+            flat = image
+
+        output_dir.mkdir(parents=True, exist_ok=True)
+        for extension, image_format, variant, options in (
+            ('webp', 'WEBP', image, {'quality': CALIDAD_IMAGENES, 'method': 6}),
+            ('jpg', 'JPEG', flat, {'quality': CALIDAD_IMAGENES, 'optimize': True, 'progressive': True}),
+        ):
+            output_file = output_dir / f'{stem}.{extension}'
+            temp_file = output_file.with_name(output_file.name + '.tmp')
+            variant.save(temp_file, format=image_format, **options)
+            os.replace(temp_file, output_file)
+        return image.size
+
+def localize_card_images(items, card_height, output_dir=None):
+    """Etapa render: reemplaza la imagen de cada item por sus copias locales
+
+    Las copias se nombran con el hash de la original, el alto y la calidad
+    (ej: imgs/cache/3f2a…-500-q80.webp): si ya existen no se vuelven a
+    codificar. Los items cuya imagen no está en la caché quedan como están.
+
+    Args:
+        items: Lista de noticias o fotos (con 'image')
+        card_height: Alto de la tarjeta en píxeles (ALTURA_IMAGEN_*)
+        output_dir: Directorio docs/
+
+    Returns:
+        Lista nueva de items; los localizados tienen 'image' (JPEG),
+        'image_webp', 'image_width' e 'image_height'
+    """
+    output_dir = Path(output_dir or 'docs')
+    variants_dir = output_dir / IMAGE_OUTPUT_DIR
+    index = load_image_index()
+    height = card_height * ESCALA_IMAGENES
+    localized = []
+    for item in items:
+        cached = index['urls'].get(item['image']) if item['image'] else None
+        if not cached or not (IMAGE_CACHE_DIR / cached).exists():
+            localized.append(item)
+            continue
+
+        stem = f"{Path(cached).stem[:20]}-{height}-q{CALIDAD_IMAGENES}"
+        size = index['variants'].get(stem)
+        if size is None or not all((variants_dir / f'{stem}.{ext}').exists() for ext in ('webp', 'jpg')):
+            try:
+                with PROFILER.phase('encode_image', image=cached):
+                    size = list(encode_card_image(IMAGE_CACHE_DIR / cached, variants_dir, stem, height))
+            except Exception as e:
+                log(f"  ✗ No se pudo procesar la imagen {item['image']}: {e}")
+                localized.append(item)
+                continue
+            index['variants'][stem] = size
+
+        # Relativa: las tarjetas con imágenes solo están en index.html
+        href = IMAGE_OUTPUT_DIR.as_posix() + '/' + stem
+        localized.append(dict(
+            item,
+            image=f'{href}.jpg',
+            image_webp=f'{href}.webp',
+            image_width=size[0],
+            image_height=size[1]
+        ))
+
+    save_image_index(index)
+    return localized
+
+def save_item_store(items, store_file=None):
+    """Guarda los items normalizados de la etapa fetch (JSON compacto)
+
+    Returns:
+        True si el contenido cambió desde el último fetch
+    """
+    content = json.dumps(items, ensure_ascii=False, separators=(',', ':'), sort_keys=True)
+    return write_if_changed(Path(store_file or ITEM_STORE_FILE), content)
+
+def load_item_store(store_file=None):
+    """Lee los items guardados por la etapa fetch (None si todavía no hay)"""
+    try:
+        return json.loads(Path(store_file or ITEM_STORE_FILE).read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return None
+
+def site_feed_files(feeds_dir):
+    """Archivo cacheado de cada feed del sitio"""
+    return {
+        'noticias': feeds_dir / 'feed-general.xml',
+        'fotos': feeds_dir / 'galeria-de-fotos.xml',
+        'agenda': feeds_dir / 'agenda-deportiva.xml'
+    }
+
+def site_feed_options():
+    """Tupla (mostrar, límite, solo con imagen) de cada feed del sitio"""
+    return {
+        'noticias': (MOSTRAR_NOTICIAS, LIMITE_NOTICIAS, SOLO_NOTICIAS_CON_IMAGEN),
+        'fotos': (MOSTRAR_FOTOS, LIMITE_FOTOS, SOLO_FOTOS_CON_IMAGEN),
+        'agenda': (MOSTRAR_AGENDA, LIMITE_AGENDA, SOLO_AGENDA_CON_IMAGEN)
+    }
+
+def youtube_feed_file(feeds_dir, handle):
+    """Archivo cacheado del feed de un canal de YouTube"""
+    return feeds_dir / 'youtube' / f'{handle}.xml'
+
+def parse_cached_items(feeds_dir=None):
+    """Parsea los feeds cacheados sin descargar ni escribir nada
+
+    Es fetch_items() sin efectos: no usa la red ni toca el catálogo, la
+    caché de imágenes o docs/ (ver DevSite).
+
+    Returns:
+        Dict con los items como el que devuelve fetch_items()
+    """
+    feeds_dir = Path(feeds_dir or 'feeds')
+    items = {'noticias': [], 'fotos': [], 'agenda': [], 'videos': []}
+    feed_files = site_feed_files(feeds_dir)
+    for feed_name, (show, limit, require_image) in site_feed_options().items():
+        if show and feed_files[feed_name].exists():
+            items[feed_name] = parse_feed_chunks(read_feed_chunks(feed_files[feed_name]),
+                                                 limit=limit, require_image=require_image)
+
+    if MOSTRAR_VIDEOS:
+        channel_videos = {
+            handle: parse_youtube_feed(youtube_feed_file(feeds_dir, handle), channel_info,
+                                       limit=YOUTUBE_VIDEOS_PER_CHANNEL_FETCH)
+            for handle, channel_info in YOUTUBE_CHANNELS.items()
+            if youtube_feed_file(feeds_dir, handle).exists()
+        }
+        items['videos'] = [video for _, video in merge_latest_videos(channel_videos, LIMITE_VIDEOS)]
+
+    return items
+
+def fetch_items():
+    """Etapa fetch: descarga y parsea los feeds
+
+    Los videos que se van a mostrar se guardan también en el catálogo.
+
+    Returns:
+        Dict con los items normalizados: {'noticias': [...], 'fotos': [...],
+        'agenda': [...], 'videos': [...]} (como los devuelven parse_feed()
+        y parse_youtube_feed())
+    """
     # Crear directorios si no existen
     output_dir = Path('docs')
     feeds_dir = Path('feeds')
@@ -1100,37 +3463,53 @@ def main():
     feeds_dir.mkdir(exist_ok=True)
 
     # Descargar feeds
-    print("\n📥 Descargando feeds desde institutoacc.com.ar...")
+    print("\n📥 Descargando feeds desde institutoacc.com.ar y YouTube...")
 
-    feed_files = {
-        'noticias': feeds_dir / 'feed-general.xml',
-        'fotos': feeds_dir / 'galeria-de-fotos.xml',
-        'agenda': feeds_dir / 'agenda-deportiva.xml'
-    }
+    feed_files = site_feed_files(feeds_dir)
 
-    # Descargar cada feed
+    # Armar la lista de descargas (feeds del sitio + canales de YouTube)
+    jobs = {}
     for feed_name, feed_url in FEED_URLS.items():
-        output_file = feed_files[feed_name]
-        download_feed(feed_url, output_file)
+        jobs[feed_name] = (feed_url, feed_files[feed_name])
 
-    # Descargar feeds de YouTube
-    youtube_feed_files = {}
+    youtube_jobs = {}
     if MOSTRAR_VIDEOS:
-        print("\n📥 Descargando feeds de YouTube...")
         youtube_feeds_dir = feeds_dir / 'youtube'
         youtube_feeds_dir.mkdir(exist_ok=True)
 
         for handle, info in YOUTUBE_CHANNELS.items():
             channel_id = info['channel_id']
             feed_url = f'https://www.youtube.com/feeds/videos.xml?channel_id={channel_id}'
-            output_file = youtube_feeds_dir / f'{handle}.xml'
-
-            print(f"\n  Canal: {info['name']}")
-            download_feed(feed_url, output_file)
-
-            # Guardar referencia si el archivo existe (descarga exitosa o caché)
-            if output_file.exists():
-                youtube_feed_files[handle] = output_file
+            youtube_jobs[handle] = (feed_url, youtube_feed_file(feeds_dir, handle))
+            jobs[f'youtube:{handle}'] = youtube_jobs[handle]
+
+    # Los feeds que se van a usar se parsean mientras se descargan
+    parsers = {}
+    for feed_name, (show, limit, require_image) in site_feed_options().items():
+        if show:
+            parse = functools.partial(parse_feed_chunks, limit=limit, require_image=require_image)
+            parsers[feed_name] = FeedParser(parse, feed_files[feed_name])
+    for handle, (_, output_file) in youtube_jobs.items():
+        parse = functools.partial(read_youtube_entries, channel_info=YOUTUBE_CHANNELS[handle],
+                                  limit=YOUTUBE_VIDEOS_PER_CHANNEL_FETCH)
+        parsers[f'youtube:{handle}'] = FeedParser(parse, output_file)
+
+    # Descargar todo en paralelo
+    with PROFILER.phase('download_all'):
+        download_results = download_feeds(jobs, parsers=parsers)
+
+    unchanged = sum(1 for result in download_results.values() if result == DESCARGA_SIN_CAMBIOS)
+    if unchanged:
+        print(f"  ✓ {unchanged}/{len(jobs)} feeds sin cambios desde la última descarga")
+    from_cache = sum(1 for result in download_results.values() if result == DESCARGA_CACHE)
+    if from_cache:
+        print(f"  ⚠ {from_cache}/{len(jobs)} feeds no se pudieron descargar, se usa la última copia guardada")
+
+    # Guardar referencia si el archivo existe (descarga exitosa o caché)
+    youtube_feed_files = {}
+    for handle, (_, output_file) in youtube_jobs.items():
+        if output_file.exists():
+            youtube_feed_files[handle] = output_file
 
     print()
 
@@ -1143,79 +3522,206 @@ def main():
         print("📰 Parseando noticias...")
         if SOLO_NOTICIAS_CON_IMAGEN:
             print("   (Filtrando solo noticias con imágenes)")
-        noticias = parse_feed(feed_files['noticias'], limit=LIMITE_NOTICIAS, require_image=SOLO_NOTICIAS_CON_IMAGEN)
+        with PROFILER.phase('parse_feed', feed='noticias'):
+            noticias = parsers['noticias'].parsed()
 
     if MOSTRAR_FOTOS and feed_files['fotos'].exists():
         print("📸 Parseando galería de fotos...")
         if SOLO_FOTOS_CON_IMAGEN:
             print("   (Filtrando solo galerías con imágenes)")
-        fotos = parse_feed(feed_files['fotos'], limit=LIMITE_FOTOS, require_image=SOLO_FOTOS_CON_IMAGEN)
+        with PROFILER.phase('parse_feed', feed='fotos'):
+            fotos = parsers['fotos'].parsed()
 
     if MOSTRAR_AGENDA and feed_files['agenda'].exists():
         print("📅 Parseando agenda deportiva...")
         if SOLO_AGENDA_CON_IMAGEN:
             print("   (Filtrando solo eventos con imágenes)")
-        agenda = parse_feed(feed_files['agenda'], limit=LIMITE_AGENDA, require_image=SOLO_AGENDA_CON_IMAGEN)
+        with PROFILER.phase('parse_feed', feed='agenda'):
+            agenda = parsers['agenda'].parsed()
+
+    # Imágenes de noticias y fotos a la caché local
+    if CACHE_IMAGENES:
+        if Image is None:
+            print("\n⚠ CACHE_IMAGENES necesita Pillow (pip install Pillow), se enlazan las imágenes originales")
+        else:
+            print("\n🖼️  Descargando imágenes nuevas...")
+            with PROFILER.phase('download_images'):
+                downloaded = download_card_images(item['image'] for item in noticias + fotos)
+            print(f"  ✓ {downloaded} imágenes nuevas en la caché")
+
+    # Catálogo persistente de videos
+    catalog = open_video_catalog(VIDEO_CATALOG_FILE, videos_dir=output_dir / 'videos')
 
     # Parsear videos de YouTube
     videos = []
     if MOSTRAR_VIDEOS:
         print("\n🎥 Parseando videos de YouTube...")
 
-        all_videos = []
+        # Cada canal es un generador: el merge solo filtra y limpia los
+        # videos que necesita, y esos (todos los que devolvió
+        # parse_youtube_feed()) son los que van al catálogo
+        channel_videos = {}
+        consumed = {}
         for handle, feed_file in youtube_feed_files.items():
+            consumed[handle] = []
+            channel_videos[handle] = record_videos(PROFILER.iterate(
+                'parse_youtube_feed',
+                parse_youtube_feed(feed_file, YOUTUBE_CHANNELS[handle], limit=YOUTUBE_VIDEOS_PER_CHANNEL_FETCH,
+                                   entries=parsers[f'youtube:{handle}'].result),
+                channel=handle
+            ), consumed[handle])
+
+        with PROFILER.phase('merge_videos'):
+            latest = merge_latest_videos(channel_videos, LIMITE_VIDEOS)
+        videos = [video for _, video in latest]
+
+        for handle, channel_consumed in consumed.items():
             channel_info = YOUTUBE_CHANNELS[handle]
-            print(f"  → {channel_info['name']}...", end=' ')
+            shown = sum(1 for video_handle, _ in latest if video_handle == handle)
+            filter_status = "(filtrado)" if channel_keyword_matcher(channel_info) else "(todos)"
+            print(f"  → {channel_info['name']}... {shown} de {len(channel_consumed)} videos procesados {filter_status}")
 
-            videos_from_channel = parse_youtube_feed(
-                feed_file,
-                channel_info,
-                limit=YOUTUBE_VIDEOS_PER_CHANNEL_FETCH
-            )
+            with PROFILER.phase('catalog'):
+                save_catalog_videos(catalog, channel_consumed, channel=handle)
+
+        print(f"\n  ✓ Total de videos a mostrar: {len(videos)}")
+    catalog.close()
 
-            filter_status = "(filtrado)" if channel_info['filter_keywords'] else "(todos)"
-            print(f"{len(videos_from_channel)} videos {filter_status}")
+    return {
+        'noticias': noticias,
+        'fotos': fotos,
+        'agenda': agenda,
+        'videos': videos
+    }
 
-            all_videos.extend(videos_from_channel)
+def render_site(items, force=False, rebuild_all=False):
+    """Etapa render: genera el sitio a partir de items ya parseados
 
-        # Ordenar por fecha (más nuevos primero) y limitar
-        all_videos.sort(key=lambda x: x['pub_date_raw'], reverse=True)
-        videos = all_videos[:LIMITE_VIDEOS]
+    No usa la red ni lee los feeds. Si las entradas (items y configuración)
+    son las mismas que en el último build, no genera nada.
 
-        print(f"\n  ✓ Total de videos a mostrar: {len(videos)}")
+    Args:
+        items: Dict de items como el que devuelve fetch_items()
+        force: Si es True, genera el sitio aunque no haya cambios
+        rebuild_all: Si es True, regenera todas las páginas de videos
+                     históricas a partir del catálogo, aunque el manifest
+                     diga que están al día
+
+    Returns:
+        0 si se generó el sitio, EXIT_SIN_CAMBIOS si no hacía falta
+    """
+    output_dir = Path('docs')
+    output_dir.mkdir(exist_ok=True)
+
+    # Los límites se aplican de nuevo por si bajaron desde el último fetch
+    noticias = items.get('noticias', [])[:LIMITE_NOTICIAS]
+    fotos = items.get('fotos', [])[:LIMITE_FOTOS]
+    agenda = items.get('agenda', [])[:LIMITE_AGENDA]
+    videos = items.get('videos', [])[:LIMITE_VIDEOS]
+
+    # Copias locales achicadas de las imágenes ya descargadas
+    if CACHE_IMAGENES and Image is not None:
+        with PROFILER.phase('images'):
+            noticias = localize_card_images(noticias, ALTURA_IMAGEN_NOTICIA, output_dir)
+            fotos = localize_card_images(fotos, ALTURA_IMAGEN_FOTO, output_dir)
+
+    catalog = open_video_catalog(VIDEO_CATALOG_FILE, videos_dir=output_dir / 'videos')
+
+    # Salir temprano si nada cambió desde el último build
+    fingerprint = build_fingerprint({
+        'noticias': noticias,
+        'fotos': fotos,
+        'agenda': agenda,
+        'videos': videos
+    })
+    if not (force or rebuild_all) and fingerprint == load_build_fingerprint() and (output_dir / 'index.html').exists():
+        catalog.close()
+        print("\n✅ Sin cambios desde el último build, no hay nada que generar")
+        return EXIT_SIN_CAMBIOS
+
+    # Hoja de estilos compartida (solo se escribe si cambió la configuración)
+    print("\n🎨 Generando hoja de estilos...")
+    with PROFILER.phase('stylesheet'):
+        stylesheet_href, stylesheet_written = write_stylesheet(output_dir)
+    if stylesheet_written:
+        print(f"✓ Hoja de estilos generada en {stylesheet_href}")
+    else:
+        print(f"✓ Hoja de estilos sin cambios ({stylesheet_href})")
+
+    # Hash de dependencias de cada salida: solo se renderiza lo que cambió
+    # (--force y --rebuild-all lo ignoran y renderizan todo)
+    manifest = OutputManifest()
+    use_manifest = not (force or rebuild_all)
 
     # Generar HTML
     print("\n🔨 Generando HTML...")
-    html = generate_html(noticias, fotos, agenda, videos)
-
-    # Guardar archivo principal
     output_file = output_dir / 'index.html'
-    output_file.write_text(html, encoding='utf-8')
-    print(f"✓ Página principal generada")
+    index_hash = output_hash('index', [noticias, fotos, agenda, videos, stylesheet_href])
+    if use_manifest and manifest.is_current(output_file, index_hash):
+        print(f"✓ Página principal sin cambios")
+    else:
+        with PROFILER.phase('render_index'):
+            html = generate_html(noticias, fotos, agenda, videos, stylesheet_href)
+
+        # Guardar archivo principal
+        with PROFILER.phase('write_index'):
+            index_written = write_html(output_file, html)
+        manifest.update(output_file, index_hash)
+        if index_written:
+            print(f"✓ Página principal generada")
+        else:
+            print(f"✓ Página principal sin cambios")
 
     # Generar páginas individuales para cada video
+    videos_dir = output_dir / 'videos'
     video_slugs = []
     if MOSTRAR_VIDEOS and videos:
         print("\n🎬 Generando páginas de videos...")
-        videos_dir = output_dir / 'videos'
         videos_dir.mkdir(exist_ok=True)
 
+        written = 0
         for video in videos:
             slug = create_slug(video['title'])
             video_slugs.append(slug)
 
-            # Crear directorio para el video
-            video_dir = videos_dir / slug
-            video_dir.mkdir(exist_ok=True)
+            video_file = videos_dir / slug / 'index.html'
+            page_hash = video_page_hash(video, slug, stylesheet_href)
+            if use_manifest and manifest.is_current(video_file, page_hash):
+                continue
 
             # Generar HTML del video
-            video_html = generate_video_page(video, slug)
-
-            # Guardar archivo
-            video_file = video_dir / 'index.html'
-            video_file.write_text(video_html, encoding='utf-8')
-
-        print(f"✓ {len(videos)} páginas de videos generadas en /videos/")
+            with PROFILER.phase('render_video_page', slug=slug):
+                video_html = generate_video_page(video, slug, stylesheet_href)
+
+            # Guardar archivo (solo si cambió)
+            with PROFILER.phase('write_video_page', slug=slug):
+                if write_html(video_file, video_html):
+                    written += 1
+            manifest.update(video_file, page_hash)
+
+        save_catalog_pages(catalog, zip(video_slugs, (video['video_id'] for video in videos)))
+
+        skipped = len(videos) - written
+        print(f"✓ {len(videos)} páginas de videos en /videos/ ({written} escritas, {skipped} sin cambios)")
+
+    # Páginas históricas: se regeneran las que no figuran en el manifest (ej:
+    # importadas de docs/videos/ o de antes del manifest) y las que cambiaron
+    # sus dependencias (ej: colores); con --rebuild-all, todas
+    with PROFILER.phase('catalog'):
+        archived = catalog_page_videos(catalog, exclude=video_slugs)
+    stale = []
+    for slug, video in archived:
+        video_file = videos_dir / slug / 'index.html'
+        page_hash = video_page_hash(video, slug, stylesheet_href)
+        if rebuild_all or not manifest.is_current(video_file, page_hash):
+            stale.append((slug, video))
+            manifest.update(video_file, page_hash)
+
+    if stale:
+        print("\n♻️  Regenerando páginas de videos históricas...")
+        with PROFILER.phase('rebuild_all', pages=len(stale)):
+            written = rebuild_video_pages(stale, videos_dir, stylesheet_href)
+        print(f"✓ {len(stale)} páginas históricas ({written} escritas, {len(stale) - written} sin cambios)")
 
     # Generar sitemap.xml
     print("\n🗺️  Generando sitemap...")
@@ -1226,36 +3732,375 @@ def main():
     except NameError:
         base_url = 'https://instituto.github.io'
 
-    # Escanear TODOS los videos existentes en el directorio (incluye videos históricos)
-    videos_dir = output_dir / 'videos'
-    all_video_slugs = []
-    if videos_dir.exists():
-        for video_dir in videos_dir.iterdir():
-            if video_dir.is_dir() and (video_dir / 'index.html').exists():
-                all_video_slugs.append(video_dir.name)
-
-    # Ordenar alfabéticamente para consistencia
-    all_video_slugs.sort()
+    # TODAS las páginas de videos del catálogo (incluye videos históricos)
+    with PROFILER.phase('catalog'):
+        all_video_pages = catalog_pages(catalog)
+    catalog.close()
 
-    sitemap_xml = generate_sitemap(base_url, all_video_slugs)
     sitemap_file = output_dir / 'sitemap.xml'
-    sitemap_file.write_text(sitemap_xml, encoding='utf-8')
-
-    # Calcular cuántos videos históricos hay
-    historical_count = len(all_video_slugs) - len(video_slugs)
-    if historical_count > 0:
-        print(f"✓ Sitemap generado con {len(all_video_slugs) + 1} URLs ({len(video_slugs)} actuales + {historical_count} históricos)")
+    sitemap_hash = output_hash('sitemap', [base_url, all_video_pages])
+    historical_count = len(all_video_pages) - len(video_slugs)
+    if use_manifest and manifest.is_current(sitemap_file, sitemap_hash):
+        print(f"✓ Sitemap sin cambios ({len(all_video_pages) + 1} URLs)")
+    else:
+        with PROFILER.phase('sitemap'):
+            sitemap = generate_sitemap(output_dir, base_url, all_video_pages)
+        manifest.update(sitemap_file, sitemap_hash)
+        shards_status = f"{len(sitemap.shards)} partes, {sitemap.written} archivos actualizados"
+
+        # Calcular cuántos videos históricos hay
+        if historical_count > 0:
+            print(f"✓ Sitemap generado con {sitemap.urls} URLs ({len(video_slugs)} actuales + {historical_count} históricos; {shards_status})")
+        else:
+            print(f"✓ Sitemap generado con {sitemap.urls} URLs ({shards_status})")
+    if MINIFICAR_HTML and (MINIFY_REPORT.pages or MINIFY_REPORT.rejected):
+        saved = MINIFY_REPORT.original - MINIFY_REPORT.minified
+        print(f"\n✂️  HTML minificado: {MINIFY_REPORT.pages} páginas, {format_bytes(MINIFY_REPORT.original)} → "
+              f"{format_bytes(MINIFY_REPORT.minified)} (ahorro de {format_bytes(saved)}, "
+              f"{100 * saved / max(1, MINIFY_REPORT.original):.0f}%)")
+        if MINIFY_REPORT.rejected:
+            print(f"  ⚠ {MINIFY_REPORT.rejected} páginas se guardaron sin minificar (el DOM minificado no era equivalente)")
+
+    # Variantes precomprimidas para servidores y CDNs que las soportan
+    if PRECOMPRIMIR:
+        print("\n🗜️  Precomprimiendo archivos...")
+        if brotli is None:
+            print("   (sin módulo brotli: solo .gz; pip install brotli para generar también .br)")
+        with PROFILER.phase('precompress'):
+            compressed, totals = precompress_outputs(output_dir, manifest)
+        print(f"✓ {compressed} variantes nuevas o actualizadas")
+        for suffix, (original, packed) in totals.items():
+            if original:
+                print(f"  → {suffix}: {format_bytes(original)} → {format_bytes(packed)} "
+                      f"(ahorro de {format_bytes(original - packed)}, {100 * (original - packed) / original:.0f}%)")
     else:
-        print(f"✓ Sitemap generado con {len(all_video_slugs) + 1} URLs")
+        removed = remove_precompressed(output_dir, manifest)
+        if removed:
+            print(f"\n🗜️  PRECOMPRIMIR desactivado: {removed} variantes .gz/.br borradas")
+
+    manifest.save()
 
     print(f"\n✅ Sitio generado exitosamente en: {output_dir.absolute()}")
     print(f"   📄 Página principal: {output_file}")
     if historical_count > 0:
-        print(f"   🎥 Videos: {len(all_video_slugs)} páginas totales ({len(video_slugs)} actualizadas, {historical_count} históricas preservadas)")
+        print(f"   🎥 Videos: {len(all_video_pages)} páginas totales ({len(video_slugs)} actualizadas, {historical_count} históricas, {len(stale)} regeneradas)")
     else:
         print(f"   🎥 Videos: {len(video_slugs)} páginas en /videos/")
     print(f"   🗺️  Sitemap: {sitemap_file}")
     print(f"\n🌐 Abrí {output_file} en tu navegador para ver el resultado!")
 
+    save_build_fingerprint(fingerprint)
+    return 0
+
+def build_site(force=False, rebuild_all=False):
+    """Descarga los feeds y genera el sitio completo (fetch + render)
+
+    Args:
+        force: Si es True, genera el sitio aunque no haya cambios
+        rebuild_all: Si es True, regenera también las páginas de videos históricas
+
+    Returns:
+        0 si se generó el sitio, EXIT_SIN_CAMBIOS si no hacía falta
+    """
+    print("🔴⚪ Generando sitio de Instituto...")
+    items = fetch_items()
+    save_item_store(items)
+    return render_site(items, force=force, rebuild_all=rebuild_all)
+
+def fetch_site():
+    """Comando `build.py fetch`: solo descarga y parsea, no genera HTML
+
+    Returns:
+        0 si hay items nuevos, EXIT_SIN_CAMBIOS si son los mismos que antes
+    """
+    print("🔴⚪ Actualizando feeds de Instituto...")
+    items = fetch_items()
+    if save_item_store(items):
+        print(f"\n✅ Items guardados en {ITEM_STORE_FILE} (generá el sitio con: python3 build.py render)")
+        return 0
+    print(f"\n✅ Sin items nuevos, {ITEM_STORE_FILE} no cambió")
+    return EXIT_SIN_CAMBIOS
+
+def render_stored_site(force=False, rebuild_all=False):
+    """Comando `build.py render`: genera el sitio desde los items guardados, sin red"""
+    print("🔴⚪ Generando sitio de Instituto...")
+    items = load_item_store()
+    if items is None:
+        print(f"✗ No hay items guardados en {ITEM_STORE_FILE}, ejecutá primero: python3 build.py fetch")
+        return 1
+    print(f"📦 Items leídos de {ITEM_STORE_FILE}")
+    return render_site(items, force=force, rebuild_all=rebuild_all)
+
+# Se inyecta en cada página del servidor de desarrollo: recarga al recibir el aviso
+LIVE_RELOAD_SCRIPT = f"""<script>
+new EventSource('{DEV_SERVER_RELOAD_PATH}').addEventListener('reload', () => location.reload());
+</script>
+"""
+
+class DevSite:
+    """Sitio renderizado en memoria para `build.py serve`
+
+    Carga una copia fresca de build.py y config.py cada vez que cambian (o
+    cambia feeds/items.json) y renderiza las páginas recién cuando se piden,
+    guardándolas en memoria hasta el próximo cambio. No escribe nada en
+    docs/: lo que no se renderiza (ej: imágenes) se sirve desde ahí.
+
+    Los items salen de feeds/items.json o, si no existe, de los feeds
+    cacheados (parse_cached_items: sin descargar ni escribir nada). El
+    catálogo de videos se abre solo para lectura.
+    """
+
+    def __init__(self, root='.'):
+        self.root = Path(root).resolve()
+        self.docs_dir = self.root / 'docs'
+        self.watched = [self.root / 'build.py', self.root / 'config.py', self.root / ITEM_STORE_FILE]
+        self.signature = None
+        self.version = 0
+        self.error = None
+        self.module = None
+        self.items = {}
+        self.video_pages = {}
+        self.pages = {}
+        self._lock = threading.RLock()
+        self.changed = threading.Condition()
+
+    def current_signature(self):
+        return tuple(path.stat().st_mtime_ns if path.exists() else None for path in self.watched)
+
+    def refresh(self):
+        """Recarga todo si cambió algún archivo vigilado
+
+        Returns:
+            True si hubo cambios (y se avisó a los navegadores)
+        """
+        signature = self.current_signature()
+        if signature == self.signature:
+            return False
+
+        with self._lock:
+            self.signature = signature
+            start = time.perf_counter()
+            try:
+                self._load()
+                self.error = None
+                log(f"  ↻ Sitio recargado en {(time.perf_counter() - start) * 1000:.0f} ms")
+            except Exception:
+                self.error = traceback.format_exc()
+                log(f"  ✗ Error al recargar:\n{self.error}")
+            self.pages.clear()
+            self.version += 1
+
+        with self.changed:
+            self.changed.notify_all()
+        return True
+
+    def _load(self):
+        importlib.reload(config)
+        spec = importlib.util.spec_from_file_location('build_dev', self.root / 'build.py')
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+
+        items = module.load_item_store(self.root / ITEM_STORE_FILE)
+        if items is None:
+            items = module.parse_cached_items(self.root / 'feeds')
+
+        self.module = module
+        self.items = {
+            'noticias': items.get('noticias', [])[:module.LIMITE_NOTICIAS],
+            'fotos': items.get('fotos', [])[:module.LIMITE_FOTOS],
+            'agenda': items.get('agenda', [])[:module.LIMITE_AGENDA],
+            'videos': items.get('videos', [])[:module.LIMITE_VIDEOS]
+        }
+
+        # Páginas de videos que se pueden pedir: las del catálogo y las actuales
+        self.video_pages = {}
+        catalog_file = self.root / VIDEO_CATALOG_FILE
+        if catalog_file.exists():
+            catalog = sqlite3.connect(f'{catalog_file.as_uri()}?mode=ro', uri=True)
+            catalog.row_factory = sqlite3.Row
+            self.video_pages = dict(module.catalog_page_videos(catalog))
+            catalog.close()
+        for video in self.items['videos']:
+            self.video_pages[module.create_slug(video['title'])] = video
+
+    def render(self, path):
+        """Contenido de una ruta del sitio
+
+        Returns:
+            Tupla (content type, bytes), o None si no es una página generada
+        """
+        with self._lock:
+            if self.error:
+                body = f'<!DOCTYPE html><html><body><h1>Error en build.py / config.py</h1><pre>{html.escape(self.error)}</pre></body></html>'
+                return 'text/html; charset=utf-8', body.encode('utf-8')
+
+            if path not in self.pages:
+                start = time.perf_counter()
+                page = self._render(path)
+                if page is None:
+                    return None
+                self.pages[path] = page
+                log(f"  → {path} renderizado en {(time.perf_counter() - start) * 1000:.1f} ms")
+            return self.pages[path]
+
+    def _render(self, path):
+        module = self.module
+        css = module.generate_stylesheet()
+        stylesheet_href = f'assets/{module.stylesheet_filename(css)}'
+
+        if path in ('/', '/index.html'):
+            items = self.items
+            content = module.generate_html(items['noticias'], items['fotos'], items['agenda'], items['videos'], stylesheet_href)
+        elif path == '/' + stylesheet_href:
+            return 'text/css; charset=utf-8', css.encode('utf-8')
+        else:
+            match = re.fullmatch(r'/videos/([^/]+)/(?:index\.html)?', path)
+            if not match or match.group(1) not in self.video_pages:
+                return None
+            slug = match.group(1)
+            content = module.generate_video_page(self.video_pages[slug], slug, stylesheet_href)
+
+        content = content.replace('</body>', LIVE_RELOAD_SCRIPT + '</body>', 1)
+        return 'text/html; charset=utf-8', content.encode('utf-8')
+
+    def static_file(self, path):
+        """Archivo de docs/ para una ruta (None si no existe o está fuera de docs/)"""
+        file = (self.docs_dir / urllib.parse.unquote(path).lstrip('/')).resolve()
+        if file.is_dir():
+            file = file / 'index.html'
+        if self.docs_dir not in file.parents or not file.is_file():
+            return None
+        return file
+
+    def watch(self):
+        """Revisa los archivos vigilados cada DEV_SERVER_WATCH_INTERVAL segundos (bloquea)"""
+        while True:
+            time.sleep(DEV_SERVER_WATCH_INTERVAL)
+            self.refresh()
+
+class DevRequestHandler(http.server.BaseHTTPRequestHandler):
+    """Atiende los pedidos del servidor de desarrollo (ver DevSite)"""
+
+    site = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_GET(self):
+        path = urllib.parse.urlsplit(self.path).path
+        if path == DEV_SERVER_RELOAD_PATH:
+            return self.send_reload_events()
+
+        page = self.site.render(path)
+        if page is not None:
+            content_type, body = page
+            return self.send_body(200, content_type, body)
+
+        file = self.site.static_file(path)
+        if file is not None:
+            content_type = mimetypes.guess_type(file.name)[0] or 'application/octet-stream'
+            return self.send_body(200, content_type, file.read_bytes())
+
+        self.send_body(404, 'text/plain; charset=utf-8', f'No encontrado: {path}'.encode('utf-8'))
+
+    def send_body(self, status, content_type, body):
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('Cache-Control', 'no-store')
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_reload_events(self):
+        """Server-Sent Events: manda `reload` cuando el sitio cambia"""
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/event-stream')
+        self.send_header('Cache-Control', 'no-store')
+        self.end_headers()
+
+        version = self.site.version
+        try:
+            while True:
+                with self.site.changed:
+                    self.site.changed.wait(timeout=15)
+                if self.site.version != version:
+                    self.wfile.write(b'event: reload\ndata: {}\n\n')
+                    self.wfile.flush()
+                    return
+                # Comentario para mantener viva la conexión
+                self.wfile.write(b': ping\n\n')
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+def serve_site(port=None):
+    """Comando `build.py serve`: servidor de desarrollo con recarga automática"""
+    port = port or DEV_SERVER_PORT
+    site = DevSite()
+    print("🔴⚪ Servidor de desarrollo de Instituto")
+    site.refresh()
+
+    DevRequestHandler.site = site
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', port), DevRequestHandler)
+    server.daemon_threads = True
+    threading.Thread(target=site.watch, daemon=True).start()
+
+    print(f"\n🌐 Abrí http://localhost:{port}/ (se recarga solo al guardar config.py o build.py; Ctrl+C para salir)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Servidor detenido")
+    finally:
+        server.server_close()
+    return 0
+
+def main(argv=None):
+    """Función principal"""
+    global PROFILER
+
+    parser = argparse.ArgumentParser(description='Generador del sitio de Instituto')
+    parser.add_argument('command', nargs='?', choices=('build', 'fetch', 'render', 'serve'), default='build',
+                        help='build: descarga y genera (default); fetch: solo descarga y guarda los items; '
+                             'render: genera el sitio desde los items guardados, sin red; '
+                             'serve: servidor de desarrollo que renderiza en memoria y recarga el navegador')
+    parser.add_argument('--port', type=int, default=DEV_SERVER_PORT,
+                        help=f'Puerto de `serve` (default: {DEV_SERVER_PORT})')
+    parser.add_argument('--profile', nargs='?', const='build-profile.json', metavar='REPORTE',
+                        help='Mide cada fase del build y guarda un reporte JSON (default: build-profile.json)')
+    parser.add_argument('--cprofile', nargs='?', const='build.prof', metavar='ARCHIVO',
+                        help='Ejecuta el build bajo cProfile y guarda las estadísticas (default: build.prof)')
+    parser.add_argument('--force', action='store_true',
+                        help='Genera el sitio aunque no haya cambios desde el último build')
+    parser.add_argument('--rebuild-all', action='store_true',
+                        help='Regenera todas las páginas de videos históricas desde el catálogo, aunque estén al día')
+    args = parser.parse_args(argv)
+
+    PROFILER = BuildProfiler(enabled=bool(args.profile))
+
+    if args.command == 'fetch':
+        run = fetch_site
+    elif args.command == 'render':
+        run = functools.partial(render_stored_site, force=args.force, rebuild_all=args.rebuild_all)
+    elif args.command == 'serve':
+        run = functools.partial(serve_site, port=args.port)
+    else:
+        run = functools.partial(build_site, force=args.force, rebuild_all=args.rebuild_all)
+
+    if args.cprofile:
+        import cProfile
+        profile = cProfile.Profile()
+        status = profile.runcall(run)
+        profile.dump_stats(args.cprofile)
+        print(f"\n📊 Estadísticas de cProfile guardadas en {args.cprofile}")
+    else:
+        status = run()
+
+    if args.profile:
+        PROFILER.print_summary()
+        PROFILER.write_report(args.profile)
+        print(f"📊 Reporte de tiempos guardado en {args.profile}")
+
+    return status
+
 if __name__ == '__main__':
-    main()
+    sys.exit(main())
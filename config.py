@@ -21,6 +21,15 @@ FEED_URLS = {
 
 DOWNLOAD_FEED = True
 
+# Descargas en paralelo
+DESCARGAS_CONCURRENTES = 8  # Cantidad máxima de feeds descargándose a la vez
+DESCARGAS_POR_HOST = 4      # Conexiones simultáneas máximas contra un mismo servidor
+
+# Límites de tiempo de las descargas (si un feed falla se usa la última copia guardada)
+DESCARGAS_PLAZO_TOTAL = 90  # Segundos máximos para todas las descargas del build
+DESCARGAS_TIMEOUT = 30      # Timeout máximo de cada pedido (se ajusta según lo que tarda cada servidor)
+DESCARGAS_REINTENTOS = 2    # Reintentos por feed ante errores de red o del servidor
+
 # ===== CONFIGURACIÓN DE COLORES =====
 
 # Colores del club (formato hexadecimal)
@@ -53,6 +62,13 @@ TEXTO_BOTON_FOTOS = 'Ver galería completa →'
 ALTURA_IMAGEN_NOTICIA = 250
 ALTURA_IMAGEN_FOTO = 250
 
+# Copias locales de las imágenes de noticias y fotos (requiere Pillow: pip install Pillow)
+# Cada imagen se descarga una sola vez y se publica achicada a la altura de la tarjeta,
+# en WebP y JPEG, dentro de docs/imgs/cache/. Sin Pillow se siguen enlazando las originales.
+CACHE_IMAGENES = False
+ESCALA_IMAGENES = 2    # Alto de las copias = alto de la tarjeta × escala (pantallas de alta densidad)
+CALIDAD_IMAGENES = 80  # Calidad de las copias WebP y JPEG (1-100)
+
 # Ancho de rayas en header/footer (en píxeles)
 ANCHO_RAYA_ROJA = 120
 ANCHO_RAYA_BLANCA = 120
@@ -97,6 +113,20 @@ OG_IMAGE = 'https://institutoacc.com.ar/wp-content/uploads/2023/logo-instituto.p
 # Cambiá esto por tu URL real cuando despliegues el sitio
 SITE_URL = 'https://instituto.com.ar'  # Dominio personalizado (ver CNAME)
 
+# URLs por archivo del sitemap (máximo del protocolo: 50.000)
+# sitemap.xml es un índice que apunta a sitemap-1.xml, sitemap-2.xml, etc.
+SITEMAP_URLS_POR_ARCHIVO = 5000
+
+# Guardar junto a cada .html/.xml/.css generado una copia comprimida .gz (y .br si
+# está instalado el módulo brotli) para servidores y CDNs que sirven archivos
+# precomprimidos (ej: gzip_static de nginx). GitHub Pages no las usa.
+PRECOMPRIMIR = False
+
+# Minificar el HTML generado: saca comentarios, indentación y espacios que no se ven
+# (respeta <script>, <style> y las descripciones de los videos). Cada página se compara
+# con la original y si el DOM no fuera el mismo se guarda sin minificar.
+MINIFICAR_HTML = False
+
 # ===== CONFIGURACIÓN DE VIDEOS DE YOUTUBE =====
 
 # Cantidad de videos a mostrar en total (11 + 1 bloque BrizuelAMP = 12 elementos)
@@ -104,6 +134,10 @@ LIMITE_VIDEOS = 15  # Se muestra 1 bloque promocional adicional
 
 # Canales de YouTube - Mapeo de handles a channel_ids
 # IMPORTANTE: Los channel_ids reales deben obtenerse con el script: bash obtener_channel_ids.sh
+#
+# Filtros opcionales por canal:
+#   'include_keywords': ['Instituto', 'Gloria']  # Reemplaza a VIDEO_FILTER_KEYWORDS (requiere filter_keywords=True)
+#   'exclude_keywords': ['Instituto Atlético Central']  # Descarta el video aunque tenga otra palabra clave
 YOUTUBE_CHANNELS = {
     # Canal oficial - TODOS los videos (sin filtrar)
     'InstitutoACC': {
@@ -175,7 +209,8 @@ YOUTUBE_CHANNELS = {
     }
 }
 
-# Palabras clave para filtrar (case-insensitive, OR lógico)
+# Palabras clave para filtrar (OR lógico, palabras completas)
+# No distingue mayúsculas ni acentos: 'La Gloria' también encuentra 'LA GLÓRIA'
 VIDEO_FILTER_KEYWORDS = ['Instituto', 'La Gloria']
 
 # Videos a buscar por canal antes de filtrar (para canales con filter_keywords=True)
@@ -188,6 +223,16 @@ MOSTRAR_VIDEOS = True
 TITULO_VIDEOS = 'Videos de Instituto'
 TEXTO_BOTON_VIDEOS = 'Ver en YouTube →'
 
+# Reproductor de las páginas /videos/
+# Con YOUTUBE_FACADE se muestra la miniatura con un botón de play y el reproductor
+# de YouTube (cientos de KB de JavaScript) se carga recién al hacer clic
+YOUTUBE_FACADE = True
+YOUTUBE_NOCOOKIE = False  # Usar youtube-nocookie.com (no guarda cookies hasta reproducir)
+YOUTUBE_PRECONNECT = True  # Pre-conectar con YouTube para que el play arranque más rápido
+
+# Procesos para regenerar todas las páginas de videos (python3 build.py --rebuild-all)
+PROCESOS_REBUILD = None  # None = uno por núcleo
+
 # Layout
 COLUMNAS_VIDEOS = 3  # 12/3 = 4 columnas
 ALTURA_IMAGEN_VIDEO = 180